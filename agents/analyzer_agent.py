@@ -1,8 +1,28 @@
 from typing import Dict, Any
+import asyncio
+import logging
 from .base_agent import BaseAgent
+from .schemas import ANALYSIS_SCHEMA
+from utils.exceptions import AnalysisError
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_FORMAT = """
+{
+    "technical_skills": ["skill1", "skill2"],
+    "years_of_experience": number,
+    "education_level": "string",
+    "experience_level": "Junior/Mid-level/Senior",
+    "key_achievements": ["achievement1", "achievement2"],
+    "domain_expertise": ["domain1", "domain2"]
+}
+"""
 
 
 class AnalyzerAgent(BaseAgent):
+    output_schema = ANALYSIS_SCHEMA
+    error_class = AnalysisError
+
     def __init__(self):
         super().__init__(
             name="Analyzer",
@@ -19,27 +39,20 @@ class AnalyzerAgent(BaseAgent):
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Analyze the extracted resume data"""
-        print("🔍 Analyzer: Analyzing candidate profile")
+        logger.info("🔍 Analyzer: Analyzing candidate profile")
 
         extracted_data = eval(messages[-1]["content"])
 
         # Get structured analysis from OpenAI
         analysis_prompt = f"""
         Analyze this resume data and return a JSON object with the following structure:
-        {{
-            "technical_skills": ["skill1", "skill2"],
-            "years_of_experience": number,
-            "education_level": "string",
-            "experience_level": "Junior/Mid-level/Senior",
-            "key_achievements": ["achievement1", "achievement2"],
-            "domain_expertise": ["domain1", "domain2"]
-        }}
+        {ANALYSIS_FORMAT}
 
         Resume data:
         {extracted_data}
         """
 
-        analysis = self._query_openai(analysis_prompt)
+        analysis = await asyncio.to_thread(self._query_structured, analysis_prompt)
 
         return {
             "analysis": analysis,
@@ -1,40 +1,171 @@
 from typing import Dict, Any
+import logging
 import json
-from openai import OpenAI
+import threading
 from dotenv import load_dotenv
 import os
+from .model_config import get_model_settings
+from .scheduler import get_scheduler
+from .schemas import parse_structured
+from utils.deadline import remaining
+from utils.exceptions import DeadlineExceeded, ResumeProcessingError
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """OpenAI client shared by all agents, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Imported here, the openai package is slow to import
+            from openai import OpenAI
+
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _client
+
+
 class BaseAgent:
+    # JSON schema the agent's output must satisfy, and the error raised when it can't
+    output_schema: Dict[str, Any] = None
+    error_class = ResumeProcessingError
+
     def __init__(self, name: str, instructions: str):
         self.name = name
         self.instructions = instructions
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.model_settings = get_model_settings(name)
+
+    @property
+    def client(self):
+        return get_openai_client()
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Default run method to be overridden by child classes"""
         raise NotImplementedError("Subclasses must implement run()")
 
-    def _query_openai(self, prompt: str) -> str:
+    def _query_openai(self, prompt: str, schema: Dict[str, Any] = None) -> str:
         """Query OpenAI model with the given prompt"""
+        from openai import APITimeoutError
+
+        settings = self.model_settings
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            return self._create_completion(
+                prompt, settings["model"], settings["latency_budget"], schema
+            )
+        except APITimeoutError:
+            if not settings["fallback_model"]:
+                raise
+            logger.warning(
+                f"⏱️ {self.name}: {settings['model']} exceeded its "
+                f"{settings['latency_budget']}s budget, retrying with {settings['fallback_model']}"
+            )
+            return self._create_completion(prompt, settings["fallback_model"], None, schema)
+        except Exception as e:
+            logger.error(f"Error querying OpenAI: {str(e)}")
+            raise
+
+    def _call_timeout(self, budget: float = None) -> float:
+        """Timeout of the next call: its budget, cut to the application's remaining time"""
+        time_left = remaining()
+        if time_left is None:
+            return budget
+        if time_left <= 0:
+            raise DeadlineExceeded(f"{self.name}: application deadline passed")
+        return min(budget, time_left) if budget else time_left
+
+    def _create_completion(
+        self, prompt: str, model: str, timeout: float = None, schema: Dict[str, Any] = None
+    ) -> str:
+        """Run a single chat completion, bounded by `timeout` seconds if given
+        and by the application's deadline.
+
+        With a schema, the model is forced to answer through a function call
+        whose parameters are the schema, and the call arguments are returned.
+        """
+        options = {}
+        if schema is not None:
+            options = {
+                "tools": [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": "submit_result",
+                            "description": f"Submit the {self.name.lower()} result",
+                            "parameters": schema,
+                        },
+                    }
+                ],
+                "tool_choice": {"type": "function", "function": {"name": "submit_result"}},
+            }
+
+        # Waits for a slot in the calling context's priority lane, at most until the deadline
+        with get_scheduler().slot(timeout=remaining()):
+            client = self.client
+            # Measured after queueing, which counts against the deadline
+            timeout = self._call_timeout(timeout)
+            if timeout:
+                # Retries would multiply the budget, the fallback model replaces them
+                client = client.with_options(max_retries=0, timeout=timeout)
+            response = client.chat.completions.create(
+                model=model,
                 messages=[
                     {"role": "system", "content": self.instructions},
                     {"role": "user", "content": prompt},
                 ],
-                temperature=0.7,
-                max_tokens=2000,
+                temperature=self.model_settings["temperature"],
+                max_tokens=self.model_settings["max_tokens"],
+                **options,
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error querying OpenAI: {str(e)}")
-            raise
+        message = response.choices[0].message
+        if schema is not None and message.tool_calls:
+            return message.tool_calls[0].function.arguments
+        return message.content
+
+    def _query_structured(self, prompt: str, schema: Dict[str, Any] = None) -> Any:
+        """Query OpenAI for output matching a schema.
+
+        Invalid output is sent back with the validation errors, so a bad
+        response costs one repair call for this stage instead of a rerun of
+        the whole pipeline.
+        """
+        schema = schema or self.output_schema
+        retries = int(os.getenv("STRUCTURED_OUTPUT_RETRIES", "2"))
+
+        request = prompt
+        for attempt in range(retries + 1):
+            output = self._query_openai(request, schema=schema)
+            data, errors = parse_structured(output, schema)
+            if not errors:
+                return data
+
+            logger.warning(
+                f"{self.name}: invalid output on attempt {attempt + 1}: {'; '.join(errors[:3])}"
+            )
+            if data is None:
+                # Nothing usable to repair (e.g. truncated), ask the original question again
+                request = f"{prompt}\n\nYour previous answer was not valid JSON. Answer again with complete, valid JSON."
+            else:
+                request = f"""
+        Your previous answer did not match the required schema.
+
+        Errors:
+        {chr(10).join(f"- {error}" for error in errors[:20])}
+
+        Previous answer:
+        {output}
+
+        Return the corrected result, keeping all valid content unchanged.
+        """
+
+        raise self.error_class(
+            f"{self.name} returned invalid output after {retries + 1} attempts: {'; '.join(errors[:5])}"
+        )
 
     def _parse_json_safely(self, text: str) -> Dict[str, Any]:
         """Safely parse JSON from text, handling potential errors"""
@@ -0,0 +1,61 @@
+from typing import Dict, Any
+import asyncio
+import logging
+from .base_agent import BaseAgent
+from .screener_agent import SCREENING_FORMAT
+from .recommender_agent import RECOMMENDATION_FORMAT
+from .schemas import DECISION_SCHEMA
+from utils.exceptions import ScreeningError
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionAgent(BaseAgent):
+    """Screening and final recommendation in a single LLM call"""
+
+    output_schema = DECISION_SCHEMA
+    error_class = ScreeningError
+
+    def __init__(self):
+        super().__init__(
+            name="Decision",
+            instructions="""Screen candidates and generate final recommendations considering:
+            - Qualification alignment, experience relevance and skill match
+            - Cultural fit indicators and red flags
+            - The extracted profile, skills analysis and job matches
+            Provide a comprehensive screening report, clear next steps and a hiring decision.""",
+        )
+
+    async def run(self, messages: list) -> Dict[str, Any]:
+        """Screen the candidate and recommend in one round-trip"""
+        logger.info("👥 Decision: Screening candidate and generating recommendations")
+
+        workflow_context = eval(messages[-1]["content"])
+
+        decision_prompt = f"""
+        Based on the candidate's profile and job matches, provide a screening report
+        and final recommendations with next steps.
+
+        Context:
+        {workflow_context}
+
+        Return a JSON object with exactly two keys:
+        - "screening_report": an object with this structure:
+        {SCREENING_FORMAT}
+        - "final_recommendation": an object with this structure:
+        {RECOMMENDATION_FORMAT}
+        """
+
+        # Off the event loop, so per-job screenings run alongside it
+        decision = await asyncio.to_thread(self._query_structured, decision_prompt)
+
+        return {
+            "screening_results": {
+                "screening_report": decision["screening_report"],
+                "screening_status": "completed",
+            },
+            "final_recommendation": {
+                "final_recommendation": decision["final_recommendation"],
+                "recommendation_status": "completed",
+            },
+        }
@@ -0,0 +1,170 @@
+"""Batched text embeddings with a content-addressed cache in the database.
+
+Backfill embeddings of existing jobs and candidates (only rows whose text
+changed, or that have none yet, are sent to the API):
+
+    python -m agents.embedding_service jobs candidates
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from db.database import JobDatabase
+from .base_agent import get_openai_client
+from .scheduler import BATCH, get_scheduler, llm_lane
+
+# numpy is imported where it's used, keeping it off the app's startup path
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = ("jobs", "candidates")
+
+
+def job_embedding_text(job: Dict[str, Any]) -> str:
+    """Text that represents a job for semantic matching"""
+    requirements = job.get("requirements", [])
+    if isinstance(requirements, str):
+        requirements = json.loads(requirements or "[]")
+    return "\n".join(
+        [
+            f"{job.get('title')} at {job.get('company')} ({job.get('experience_level')})",
+            job.get("description") or "",
+            "Requirements: " + ", ".join(requirements),
+        ]
+    )
+
+
+class EmbeddingService:
+    """Embed texts in multi-input requests, reusing vectors already in the database.
+
+    Vectors are keyed by a hash of the model and the text, so identical text
+    is only ever embedded once. Set EMBEDDING_BASE_URL to use another
+    OpenAI-compatible endpoint, such as tools/embedding_stub.py in tests.
+    """
+
+    def __init__(
+        self,
+        db: Optional[JobDatabase] = None,
+        model: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        base_url: Optional[str] = None,
+    ):
+        self.db = db or JobDatabase()
+        self.model = model or os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+        self.batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+        # ~8k tokens, the input limit of OpenAI embedding models
+        self.max_chars = int(os.getenv("EMBEDDING_MAX_CHARS", "24000"))
+        self.base_url = base_url or os.getenv("EMBEDDING_BASE_URL")
+        self._client = None
+
+    @property
+    def client(self):
+        if not self.base_url:
+            return get_openai_client()
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY", "stub"), base_url=self.base_url
+            )
+        return self._client
+
+    def _prepare(self, text: str) -> str:
+        # The API rejects empty input
+        return text[: self.max_chars] or " "
+
+    def text_hash(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\n{text}".encode("utf-8")).hexdigest()
+
+    def embed(self, texts: List[str]) -> List["np.ndarray"]:
+        """Embedding vectors of `texts`, in order"""
+        import numpy as np
+
+        texts = [self._prepare(text) for text in texts]
+        hashes = [self.text_hash(text) for text in texts]
+        vectors = self.db.get_embeddings(list(dict.fromkeys(hashes)))
+
+        missing = list({h: t for h, t in zip(hashes, texts) if h not in vectors}.items())
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            with get_scheduler().slot():
+                response = self.client.embeddings.create(
+                    model=self.model, input=[text for _, text in batch]
+                )
+            data = sorted(response.data, key=lambda d: d.index)
+            rows = [
+                (text_hash, self.model, np.asarray(d.embedding, dtype=np.float32))
+                for (text_hash, _), d in zip(batch, data)
+            ]
+            self.db.save_embeddings(rows)
+            vectors.update({text_hash: vector for text_hash, _, vector in rows})
+
+        if missing:
+            logger.info(
+                f"Embedded {len(missing)} texts in {-(-len(missing) // self.batch_size)} "
+                f"requests ({len(set(hashes)) - len(missing)} cached)"
+            )
+        return [vectors[h] for h in hashes]
+
+    def _entity_texts(self, entity_type: str, after_id: int, limit: int) -> List[tuple]:
+        """(id, text) of the next page of jobs or candidates"""
+        if entity_type == "jobs":
+            return [
+                (job["id"], job_embedding_text(job))
+                for job in self.db.get_jobs_after(after_id, limit)
+            ]
+        return self.db.get_candidate_texts_after(after_id, limit)
+
+    def backfill(self, entity_type: str, page_size: int = 500) -> int:
+        """Embed jobs or candidates that have no embedding for their current text"""
+        if entity_type not in ENTITY_TYPES:
+            raise ValueError(f"Unknown entity type '{entity_type}', expected one of {ENTITY_TYPES}")
+
+        current = self.db.get_entity_embedding_hashes(entity_type)
+        updated = 0
+        after_id = 0
+        # Keyset pagination: no read cursor stays open while embeddings are written
+        while True:
+            page = self._entity_texts(entity_type, after_id, page_size)
+            if not page:
+                break
+            after_id = page[-1][0]
+
+            hashes = [(entity_id, self.text_hash(self._prepare(text))) for entity_id, text in page]
+            stale = [
+                (entity_id, text, text_hash)
+                for (entity_id, text), (_, text_hash) in zip(page, hashes)
+                if current.get(entity_id) != text_hash
+            ]
+            if stale:
+                self.embed([text for _, text, _ in stale])
+                self.db.link_embeddings(
+                    entity_type, [(entity_id, text_hash) for entity_id, _, text_hash in stale]
+                )
+                updated += len(stale)
+
+        logger.info(f"Backfilled embeddings of {updated} {entity_type}")
+        return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entity_types", nargs="+", choices=ENTITY_TYPES)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    service = EmbeddingService()
+    # Bulk work, interactive requests go first
+    with llm_lane(BATCH):
+        for entity_type in args.entity_types:
+            print(f"{entity_type}: {service.backfill(entity_type, args.page_size)} embedded")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,52 @@
 from typing import Dict, Any
-from pdfminer.high_level import extract_text # pip install pdfminer.six
+import asyncio
+import logging
+import re
 from .base_agent import BaseAgent
+from .schemas import EXTRACTION_SCHEMA
+from utils.exceptions import ExtractionError
+from tools.pdf_text import PDFTextExtractor
+from tools.text_compactor import compact_resume_text
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+
+
+def _find_phone(text: str):
+    # 9-15 digits, so date ranges like "2015 - 2019" aren't taken for numbers
+    for match in PHONE_RE.finditer(text):
+        if 9 <= sum(c.isdigit() for c in match.group(0)) <= 15:
+            return match.group(0)
+    return None
+
+
+def refresh_personal_info(personal_info: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Personal info of another resume, corrected to what `text` says.
+
+    Email and phone are read from the text; name and location are kept
+    only if the text still contains them.
+    """
+    email = EMAIL_RE.search(text)
+    phone = _find_phone(text)
+    return {
+        **personal_info,
+        **{
+            field: personal_info.get(field)
+            if personal_info.get(field)
+            and re.search(rf"\b{re.escape(personal_info[field])}\b", text, re.IGNORECASE)
+            else None
+            for field in ("name", "location")
+        },
+        "email": email.group(0) if email else None,
+        "phone": phone,
+    }
 
 class ExtractorAgent(BaseAgent):
+    output_schema = EXTRACTION_SCHEMA
+    error_class = ExtractionError
+
     def __init__(self):
         super().__init__(
             name="Extractor",
@@ -10,24 +54,82 @@ class ExtractorAgent(BaseAgent):
             Focus on: personal info, work experience, education, skills, and certifications.
             Provide output in a clear, structured format."""
         )
+        self.pdf_extractor = PDFTextExtractor()
     
+    def load_resume_text(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract and compact resume text, returning it with extraction stats"""
+        # The orchestrator may already have loaded the text, e.g. for duplicate checks
+        if resume_data.get("loaded_text"):
+            return resume_data["loaded_text"]
+
+        extraction_stats = {}
+        if resume_data.get("file_content") is not None:
+            extraction_stats = self.pdf_extractor.extract(resume_data["file_content"])
+        elif resume_data.get("file_path"):
+            extraction_stats = self.pdf_extractor.extract(resume_data["file_path"])
+
+        if extraction_stats:
+            raw_text = extraction_stats.pop("text")
+            if extraction_stats["truncated"]:
+                logger.info(
+                    f"📄 Extractor: Truncated to {extraction_stats['pages_extracted']} "
+                    f"of {extraction_stats['total_pages']} pages"
+                )
+        else:
+            raw_text = resume_data.get("text", "")
+
+        # Drop layout noise so this and every later stage sends fewer tokens
+        raw_text, compaction_stats = compact_resume_text(raw_text)
+        logger.info(
+            f"📄 Extractor: Compacted resume text from {compaction_stats['tokens_before']} "
+            f"to {compaction_stats['tokens_after']} tokens "
+            f"({compaction_stats['token_reduction_pct']}% reduction)"
+        )
+
+        return {
+            "raw_text": raw_text,
+            "extraction_stats": extraction_stats,
+            "compaction_stats": compaction_stats,
+        }
+
+    def reuse_extraction(
+        self, previous: Dict[str, Any], loaded: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Extraction of a near-duplicate resume, carried over to this resume's text"""
+        structured = previous.get("structured_data")
+        if isinstance(structured, dict):
+            # The same resume may be sent by someone else, or with new contact details
+            structured = {
+                **structured,
+                "personal_info": refresh_personal_info(
+                    structured.get("personal_info") or {}, loaded["raw_text"]
+                ),
+            }
+        return {
+            **previous,
+            "raw_text": loaded["raw_text"],
+            "structured_data": structured,
+            "extraction_stats": loaded["extraction_stats"],
+            "compaction_stats": loaded["compaction_stats"],
+        }
+
     async def run(self, messages: list) -> Dict[str, Any]:
         """Process the resume and extract information"""
-        print("📄 Extractor: Processing resume")
+        logger.info("📄 Extractor: Processing resume")
         
-        resume_data = eval(messages[-1]["content"])
+        content = messages[-1]["content"]
+        # In-memory uploads are passed as a dict, since bytes don't survive str()/eval()
+        resume_data = content if isinstance(content, dict) else eval(content)
         
-        # Extract text from PDF
-        if resume_data.get("file_path"):
-            raw_text = extract_text(resume_data["file_path"])
-        else:
-            raw_text = resume_data.get("text", "")
+        loaded = await asyncio.to_thread(self.load_resume_text, resume_data)
 
         # Get structured information from OpenAI
-        extracted_info = self._query_openai(raw_text)
+        extracted_info = await asyncio.to_thread(self._query_structured, loaded["raw_text"])
 
         return {
-            "raw_text": raw_text,
+            "raw_text": loaded["raw_text"],
             "structured_data": extracted_info,
+            "extraction_stats": loaded["extraction_stats"],
+            "compaction_stats": loaded["compaction_stats"],
             "extraction_status": "completed"
         }
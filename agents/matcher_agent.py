@@ -1,10 +1,110 @@
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+from functools import lru_cache
 from .base_agent import BaseAgent
+from .schemas import CANDIDATE_RANKING_SCHEMA, MATCHES_SCHEMA
+from utils.exceptions import MatchingError
+from db.async_database import get_async_database
 from db.database import JobDatabase
 import json
+import re
+
+logger = logging.getLogger(__name__)
+
+# Requirements like "3+ years experience" aren't skills
+_EXPERIENCE_REQUIREMENT = re.compile(r"\d+\+?\s*years?", re.IGNORECASE)
+
+_SKILL_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+# Seniority order of experience levels, matched by keyword
+_EXPERIENCE_RANKS = [
+    ("intern", 0), ("entry", 0), ("junior", 0),
+    ("mid", 1), ("intermediate", 1),
+    ("senior", 2),
+    ("lead", 3), ("staff", 3), ("principal", 3),
+]
+
+# Weight of skill coverage vs. experience fit in the reverse-matching score
+_SKILL_WEIGHT = 0.8
+
+
+def _skill_requirements(job: Dict[str, Any]) -> List[str]:
+    return [
+        r.lower() for r in job.get("requirements", []) if not _EXPERIENCE_REQUIREMENT.search(r)
+    ]
+
+
+# Tokens of a requirement, and every run of consecutive tokens in it
+PreparedRequirement = Tuple[tuple, FrozenSet[tuple]]
+
+
+# Cached: the same skills recur across most candidates
+@lru_cache(maxsize=65536)
+def _skill_tokens(text: str) -> tuple:
+    """Lowercase word tokens, keeping the symbols of names like C++, C# and Node.js"""
+    return tuple(token.rstrip(".") for token in _SKILL_TOKEN.findall(text.lower()))
+
+
+@lru_cache(maxsize=65536)
+def _phrases(tokens: tuple) -> FrozenSet[tuple]:
+    """Every run of consecutive tokens in `tokens`"""
+    return frozenset(
+        tokens[i:j] for i in range(len(tokens)) for j in range(i + 1, len(tokens) + 1)
+    )
+
+
+def prepare_requirements(requirements: List[str]) -> List[PreparedRequirement]:
+    """Tokenize a job's requirements once, for scoring any number of candidates"""
+    return [(tokens, _phrases(tokens)) for tokens in map(_skill_tokens, requirements)]
+
+
+def _coverage(skills: List[str], requirements: List[PreparedRequirement]) -> float:
+    if not requirements:
+        return 0.0
+    # Whole tokens, so "go" doesn't match "django" nor "java" match "javascript"
+    skill_tokens = {tokens for tokens in map(_skill_tokens, filter(None, skills)) if tokens}
+    skill_phrases = frozenset().union(*map(_phrases, skill_tokens))
+    # Covered when a skill appears in the requirement, or the requirement in a skill
+    covered = sum(
+        1
+        for tokens, phrases in requirements
+        if tokens and (tokens in skill_phrases or not skill_tokens.isdisjoint(phrases))
+    )
+    return round(100 * covered / len(requirements), 1)
+
+
+def local_match_score(skills: List[str], job: Dict[str, Any]) -> float:
+    """Share of a job's skill requirements covered by the candidate (0-100)"""
+    return _coverage(skills, prepare_requirements(_skill_requirements(job)))
+
+
+@lru_cache(maxsize=1024)
+def _experience_rank(level: Optional[str]) -> Optional[int]:
+    level = (level or "").lower()
+    for keyword, rank in _EXPERIENCE_RANKS:
+        if keyword in level:
+            return rank
+    return None
+
+
+def experience_fit(candidate_level: Optional[str], job_level: Optional[str]) -> float:
+    """How well a candidate's experience level fits the job's (0-100, 50 when unknown)"""
+    candidate_rank = _experience_rank(candidate_level)
+    job_rank = _experience_rank(job_level)
+    if candidate_rank is None or job_rank is None:
+        return 50.0
+    return {0: 100.0, 1: 50.0}.get(abs(candidate_rank - job_rank), 0.0)
 
 
 class MatcherAgent(BaseAgent):
+    output_schema = MATCHES_SCHEMA
+    error_class = MatchingError
+
     def __init__(self):
         super().__init__(
             name="Matcher",
@@ -14,30 +114,68 @@ class MatcherAgent(BaseAgent):
             Return matches in JSON format with title, match_score, and location fields.""",
         )
         self.db = JobDatabase()
+        self.async_db = get_async_database()
+        # Catalogs larger than one chunk are scored chunk by chunk ("chunked"),
+        # or always in a single prompt ("single")
+        self.matching_mode = os.getenv("MATCHING_MODE", "chunked")
+        self.chunk_size = int(os.getenv("MATCH_CHUNK_SIZE", "25"))
+        self.chunk_concurrency = int(os.getenv("MATCH_CHUNK_CONCURRENCY", "4"))
+        self.top_k = int(os.getenv("MATCH_TOP_K", "10"))
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Match candidate with available positions"""
-        print("🎯 Matcher: Finding suitable job matches")
+        logger.info("🎯 Matcher: Finding suitable job matches")
 
         # Get candidate profile from previous step
         candidate_data = eval(messages[-1]["content"])
 
         # Get available jobs from database
-        available_jobs = self.db.get_all_jobs()
+        available_jobs = await self.async_db.get_all_jobs()
 
-        # Create matching prompt
-        matching_prompt = f"""
+        # Cheap local scores, used by the orchestrator's early-exit rules
+        profile = candidate_data.get("analysis", {})
+        if isinstance(profile, str):
+            profile = self._parse_json_safely(profile)
+        skills = profile.get("technical_skills", []) if "error" not in profile else []
+        local_scores = sorted(
+            (
+                {"job_id": job["id"], "score": local_match_score(skills, job)}
+                for job in available_jobs
+            ),
+            key=lambda m: m["score"],
+            reverse=True,
+        )
+
+        if self.matching_mode == "chunked" and len(available_jobs) > self.chunk_size:
+            matches = await self._match_chunked(candidate_data, available_jobs)
+        else:
+            # Get matches from OpenAI
+            matches = (
+                await asyncio.to_thread(
+                    self._query_structured, self._matching_prompt(candidate_data, available_jobs)
+                )
+            )["matches"]
+
+        return {
+            "matches": matches,
+            "local_scores": local_scores[:5],
+            "top_local_score": local_scores[0]["score"] if local_scores else 0.0,
+            "matching_status": "completed"
+        }
+
+    def _matching_prompt(self, candidate_data: Dict[str, Any], jobs: List[Dict[str, Any]]) -> str:
+        return f"""
         Given this candidate profile and list of available jobs, find the best matches.
-        Return a JSON array of matches with scores and reasoning.
+        Return a JSON object with a "matches" array of matches with scores and reasoning.
 
         Candidate Profile:
         {candidate_data}
 
         Available Jobs:
-        {json.dumps(available_jobs, indent=2)}
+        {json.dumps(jobs, indent=2)}
 
         Return format:
-        [
+        {{"matches": [
             {{
                 "job_id": "string",
                 "match_score": number (0-100),
@@ -45,13 +183,138 @@ class MatcherAgent(BaseAgent):
                 "key_matches": ["skill1", "skill2"],
                 "gaps": ["missing_skill1", "missing_skill2"]
             }}
+        ]}}
+        """
+
+    async def _match_chunked(
+        self, candidate_data: Dict[str, Any], jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Score fixed-size chunks of the catalog concurrently and merge a global top-K.
+
+        Chunks follow job id order, so adding a job only changes the last chunk,
+        and each chunk's matches are cached per candidate profile.
+        """
+        jobs = sorted(jobs, key=lambda job: job["id"])
+        chunks = [jobs[i : i + self.chunk_size] for i in range(0, len(jobs), self.chunk_size)]
+        chunk_hashes = [
+            hashlib.sha256(json.dumps(chunk, sort_keys=True, default=str).encode()).hexdigest()
+            for chunk in chunks
         ]
+        candidate_hash = hashlib.sha256(
+            json.dumps(candidate_data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        cached = await self.async_db.get_chunk_matches(candidate_hash, chunk_hashes)
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def score(chunk: List[Dict[str, Any]], chunk_hash: str) -> List[Dict[str, Any]]:
+            if chunk_hash in cached:
+                return cached[chunk_hash]
+            async with semaphore:
+                matches = (
+                    await asyncio.to_thread(
+                        self._query_structured, self._matching_prompt(candidate_data, chunk)
+                    )
+                )["matches"]
+            # Drop anything the model invented outside this chunk
+            job_ids = {str(job["id"]) for job in chunk}
+            matches = [m for m in matches if str(m["job_id"]) in job_ids]
+            await self.async_db.save_chunk_matches(candidate_hash, chunk_hash, matches)
+            return matches
+
+        results = await asyncio.gather(
+            *(score(chunk, chunk_hash) for chunk, chunk_hash in zip(chunks, chunk_hashes))
+        )
+        logger.info(
+            f"🎯 Matcher: Scored {len(chunks)} job chunks "
+            f"({sum(1 for h in chunk_hashes if h in cached)} cached)"
+        )
+        return heapq.nlargest(
+            self.top_k,
+            (match for matches in results for match in matches),
+            key=lambda m: m["match_score"],
+        )
+
+    def rank_candidates_for_job(
+        self, job_id: int, k: int = 20, explain_top: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Rank stored candidates for a job, best first.
+
+        Every candidate's latest analysis is scored locally while streaming
+        from the database, keeping only a bounded top-K heap in memory. The
+        best `explain_top` are then sent to the LLM for reasoning.
         """
+        job = self.db.get_job(job_id)
+        if job is None:
+            raise MatchingError(f"Job {job_id} not found")
 
-        # Get matches from OpenAI
-        matches = self._query_openai(matching_prompt)
+        requirements = prepare_requirements(_skill_requirements(job))
+        job_level = job.get("experience_level")
 
-        return {
-            "matches": matches,
-            "matching_status": "completed"
+        def scored():
+            for profile in self.db.iter_candidate_profiles():
+                skill_score = _coverage(profile["technical_skills"], requirements)
+                level_score = experience_fit(profile["experience_level"], job_level)
+                score = round(
+                    _SKILL_WEIGHT * skill_score + (1 - _SKILL_WEIGHT) * level_score, 1
+                )
+                # application_id breaks ties so the heap never compares dicts
+                yield score, profile["application_id"], skill_score, level_score, profile
+
+        # Result dicts are only built for the shortlist
+        ranked = [
+            {
+                **profile,
+                "skill_score": skill_score,
+                "experience_score": level_score,
+                "local_score": score,
+            }
+            for score, _, skill_score, level_score, profile in heapq.nlargest(k, scored())
+        ]
+        logger.info(f"🎯 Matcher: Ranked top {len(ranked)} candidates for job {job_id}")
+
+        if explain_top and ranked:
+            self._explain_ranking(job, ranked[:explain_top])
+        return ranked
+
+    def _explain_ranking(self, job: Dict[str, Any], candidates: List[Dict[str, Any]]):
+        """Add LLM scores and reasoning to the given candidates in place"""
+        profiles = [
+            {
+                "application_id": c["application_id"],
+                "current_title": c.get("current_title"),
+                "technical_skills": c["technical_skills"],
+                "experience_level": c["experience_level"],
+                "education_level": c["education_level"],
+                "domain_expertise": c["domain_expertise"],
+            }
+            for c in candidates
+        ]
+        ranking_prompt = f"""
+        Given this job and a shortlist of candidate profiles, assess how well each
+        candidate fits the job. Return a JSON object with a "candidates" array holding
+        one entry per candidate with its application_id, match_score (0-100),
+        reasoning, key_matches and gaps.
+
+        Job:
+        {json.dumps(job, indent=2, default=str)}
+
+        Candidates:
+        {json.dumps(profiles, indent=2)}
+        """
+
+        explanations = {
+            str(e["application_id"]): e
+            for e in self._query_structured(ranking_prompt, CANDIDATE_RANKING_SCHEMA)["candidates"]
         }
+        for candidate in candidates:
+            explanation = explanations.get(str(candidate["application_id"]))
+            if explanation:
+                candidate.update(
+                    {
+                        "match_score": explanation["match_score"],
+                        "reasoning": explanation["reasoning"],
+                        "key_matches": explanation["key_matches"],
+                        "gaps": explanation["gaps"],
+                    }
+                )
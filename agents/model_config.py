@@ -0,0 +1,56 @@
+from typing import Dict, Any
+import json
+import os
+from functools import lru_cache
+
+DEFAULT_MODEL_SETTINGS = {
+    "model": "gpt-4",
+    "temperature": 0.7,
+    "max_tokens": 2000,
+    # Seconds before a call is abandoned in favour of the fallback model
+    "latency_budget": None,
+    "fallback_model": None,
+}
+
+_SETTING_TYPES = {
+    "model": str,
+    "temperature": float,
+    "max_tokens": int,
+    "latency_budget": float,
+    "fallback_model": str,
+}
+
+
+@lru_cache(maxsize=1)
+def _load_config_file() -> Dict[str, Any]:
+    """Read the optional JSON model config pointed to by MODEL_CONFIG_PATH"""
+    path = os.getenv("MODEL_CONFIG_PATH")
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _env_settings(prefix: str) -> Dict[str, Any]:
+    settings = {}
+    for key, cast in _SETTING_TYPES.items():
+        value = os.getenv(f"{prefix}_{key.upper()}")
+        if value:
+            settings[key] = cast(value)
+    return settings
+
+
+def get_model_settings(agent_name: str) -> Dict[str, Any]:
+    """Resolve model settings for an agent.
+
+    Later sources override earlier ones: built-in defaults, LLM_* env vars,
+    the "default" and agent entries of the MODEL_CONFIG_PATH file, then
+    <AGENT>_* env vars (e.g. EXTRACTOR_MODEL, EXTRACTOR_LATENCY_BUDGET).
+    """
+    config = _load_config_file()
+    settings = dict(DEFAULT_MODEL_SETTINGS)
+    settings.update(_env_settings("LLM"))
+    settings.update(config.get("default", {}))
+    settings.update(config.get(agent_name, {}))
+    settings.update(_env_settings(agent_name.upper()))
+    return settings
@@ -1,14 +1,80 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+import hashlib
+import os
+import threading
+import uuid
 from .base_agent import BaseAgent
 from .extractor_agent import ExtractorAgent
 from .analyzer_agent import AnalyzerAgent
 from .matcher_agent import MatcherAgent
 from .screener_agent import ScreenerAgent
 from .recommender_agent import RecommenderAgent
+from .profile_agent import ProfileAgent
+from .decision_agent import DecisionAgent
+from .prescreen import ShortCircuitRules, templated_rejection
+from tools.near_duplicate import NearDuplicateIndex
+from utils.deadline import (
+    deadline_after,
+    deadline_expired,
+    default_deadline_seconds,
+    remaining,
+)
+from utils.exceptions import DeadlineExceeded
+from utils.logger import application_context
+from utils.profiling import mark_stage, maybe_profile
+
+logger = logging.getLogger(__name__)
+
+
+def _without_raw_text(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in extracted_data.items() if k != "raw_text"}
+
+
+def _stage_context(workflow_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Workflow context minus the resume text, which later stages don't need"""
+    if "extracted_data" not in workflow_context:
+        return workflow_context
+    return {
+        **workflow_context,
+        "extracted_data": _without_raw_text(workflow_context["extracted_data"]),
+    }
+
+# standard:   extract, analyze, match, screen, recommend (5 + N LLM calls)
+# fused:      extract+analyze, match, screen, recommend (4 + N LLM calls)
+# fused_full: extract+analyze, match, screen+recommend (3 + N LLM calls)
+# where N is SCREEN_PER_JOB_TOP_N, one screening per top matched job (fewer when
+# fewer jobs match). Chunked matching adds a call per uncached catalog chunk, and
+# an early exit skips the screening and recommendation calls.
+PIPELINE_MODES = ("standard", "fused", "fused_full")
+
+# Outputs in the workflow context, in the order the stages produce them
+PIPELINE_STAGES = (
+    "extracted_data",
+    "analysis_results",
+    "job_matches",
+    "screening_results",
+    "final_recommendation",
+)
 
 
 class OrchestratorAgent(BaseAgent):
-    def __init__(self):
+    # Completed results keyed by (resume content hash, job catalog version),
+    # shared across instances since the app builds one orchestrator per upload
+    _result_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    # Applications being processed, by the same key; identical concurrent
+    # submissions (often from different event loops) wait on the first one
+    _in_flight: Dict[Tuple[str, str], Future] = {}
+    result_cache_size = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+
+    def __init__(self, mode: str = None):
+        self.mode = mode or os.getenv("PIPELINE_MODE", "standard")
+        if self.mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{self.mode}', expected one of {PIPELINE_MODES}")
         super().__init__(
             name="Orchestrator",
             instructions="""Coordinate the recruitment workflow and delegate tasks to specialized agents.
@@ -24,6 +90,14 @@ class OrchestratorAgent(BaseAgent):
         self.matcher = MatcherAgent()
         self.screener = ScreenerAgent()
         self.recommender = RecommenderAgent()
+        self.short_circuit_rules = ShortCircuitRules()
+        self.near_duplicate_index = None
+        if os.getenv("NEAR_DUPLICATE_DETECTION", "true").lower() == "true":
+            self.near_duplicate_index = NearDuplicateIndex(self.matcher.db)
+        if self.mode in ("fused", "fused_full"):
+            self.profiler = ProfileAgent()
+        if self.mode == "fused_full":
+            self.decider = DecisionAgent()
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Process a single message through the agent"""
@@ -33,60 +107,325 @@ class OrchestratorAgent(BaseAgent):
 
     async def process_application(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """Main workflow orchestrator for processing job applications"""
-        print("🎯 Orchestrator: Starting application process")
+        application_id = resume_data.get("application_id") or uuid.uuid4().hex[:12]
+        deadline_seconds = resume_data.get("deadline_seconds")
+        if deadline_seconds is None:
+            deadline_seconds = default_deadline_seconds()
+        # Profiled runs may queue for the profiler, before their deadline starts
+        async with maybe_profile(application_id, bool(resume_data.get("profile"))):
+            with application_context(application_id), deadline_after(deadline_seconds):
+                return await self._run_pipeline({**resume_data, "application_id": application_id})
 
-        workflow_context = {
-            "resume_data": resume_data,
+    async def _run_pipeline(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the agent stages for one application"""
+        logger.info("🎯 Orchestrator: Starting application process")
+
+        # Hash the upload once; it keys the result cache for this catalog version
+        if resume_data.get("file_content") is not None and not resume_data.get("content_hash"):
+            resume_data = {
+                **resume_data,
+                "content_hash": hashlib.sha256(resume_data["file_content"]).hexdigest(),
+            }
+        catalog_version = await self.matcher.async_db.get_catalog_version()
+        if not resume_data.get("content_hash"):
+            return await self._run_stages(resume_data, catalog_version, None)
+
+        cache_key = (resume_data["content_hash"], catalog_version)
+        cached, in_flight, leader = self._claim(cache_key)
+        if cached is not None:
+            logger.info("⚡ Orchestrator: Returning cached result for identical resume")
+            return cached
+        if not leader:
+            logger.info("🔗 Orchestrator: Waiting for in-flight processing of identical resume")
+            try:
+                # Bounded by this application's own deadline, not the leader's. Shielded,
+                # so a waiter that gives up doesn't cancel the shared computation
+                result = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(in_flight)), timeout=remaining()
+                )
+            except asyncio.TimeoutError:
+                workflow_context = self._initial_context(resume_data)
+                workflow_context["current_stage"] = "coalesced wait"
+                return {
+                    **self._partial_result(workflow_context),
+                    "error": "Deadline reached while waiting for an identical upload",
+                    "coalesced": True,
+                }
+            return {**result, "coalesced": True}
+
+        try:
+            result = await self._run_stages(resume_data, catalog_version, cache_key)
+            in_flight.set_result(result)
+            return result
+        except BaseException as e:
+            in_flight.set_exception(e)
+            raise
+        finally:
+            with self._result_cache_lock:
+                self._in_flight.pop(cache_key, None)
+
+    def _initial_context(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Workflow context of an application before any stage has run"""
+        return {
+            # Raw file bytes stay out of the context that later stages stringify
+            "resume_data": {
+                k: v for k, v in resume_data.items() if k not in ("file_content", "loaded_text")
+            },
             "status": "initiated",
             "current_stage": "extraction",
         }
 
+    async def _run_stages(
+        self,
+        resume_data: Dict[str, Any],
+        catalog_version: str,
+        cache_key: Optional[Tuple[str, str]],
+    ) -> Dict[str, Any]:
+        """Process an application that has no cached or in-flight result"""
+        workflow_context = self._initial_context(resume_data)
+        mark_stage("extraction")
+
         try:
+            # Cancels the stage running at the deadline; stages blocked in an LLM
+            # call are bounded by its timeout, which is cut to the same deadline
+            return await asyncio.wait_for(
+                self._execute_stages(resume_data, catalog_version, cache_key, workflow_context),
+                timeout=remaining(),
+            )
+        except Exception as e:
+            if isinstance(e, (asyncio.TimeoutError, DeadlineExceeded)) or deadline_expired():
+                return self._partial_result(workflow_context)
+            workflow_context.update({"status": "failed", "error": str(e)})
+            raise
+
+    async def _execute_stages(
+        self,
+        resume_data: Dict[str, Any],
+        catalog_version: str,
+        cache_key: Optional[Tuple[str, str]],
+        workflow_context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run the agent stages, recording each stage's output in `workflow_context`"""
+        # Load the text up front so re-applications are caught before any LLM call
+        duplicate = None
+        if self.near_duplicate_index is not None:
+            # PDF extraction blocks, keep it off the loop so the deadline can fire
+            loaded_text = await asyncio.to_thread(self.extractor.load_resume_text, resume_data)
+            resume_data = {**resume_data, "loaded_text": loaded_text}
+            duplicate = await self.matcher.async_db.run(
+                self.near_duplicate_index.find, loaded_text["raw_text"]
+            )
+
+        if duplicate and duplicate["catalog_version"] == catalog_version:
+            logger.info(
+                f"♻️ Orchestrator: Reusing results of a near-duplicate resume "
+                f"({duplicate['similarity']:.0%} similar)"
+            )
+            workflow_context = {
+                **duplicate["result"],
+                "extracted_data": self.extractor.reuse_extraction(
+                    duplicate["result"]["extracted_data"], loaded_text
+                ),
+                "resume_data": workflow_context["resume_data"],
+                "near_duplicate_of": duplicate["signature_id"],
+                "near_duplicate_similarity": duplicate["similarity"],
+            }
+            if cache_key is not None:
+                self._store_cached_result(cache_key, _stage_context(workflow_context))
+            return workflow_context
+
+        if duplicate:
+            # The catalog changed since, so only the candidate profile is reused
+            logger.info(
+                f"♻️ Orchestrator: Reusing profile of a near-duplicate resume "
+                f"({duplicate['similarity']:.0%} similar)"
+            )
+            extracted_data = self.extractor.reuse_extraction(
+                duplicate["result"]["extracted_data"], loaded_text
+            )
+            analysis_results = duplicate["result"]["analysis_results"]
+            workflow_context.update(
+                {
+                    "extracted_data": extracted_data,
+                    "analysis_results": analysis_results,
+                    "near_duplicate_of": duplicate["signature_id"],
+                    "near_duplicate_similarity": duplicate["similarity"],
+                    "current_stage": "matching",
+                }
+            )
+            mark_stage("matching")
+        elif self.mode in ("fused", "fused_full"):
+            # Extract and analyze in a single call
+            profile = await self.profiler.run(
+                [{"role": "user", "content": resume_data}]
+            )
+            extracted_data = profile["extracted_data"]
+            analysis_results = profile["analysis_results"]
+            workflow_context.update(
+                {
+                    "extracted_data": extracted_data,
+                    "analysis_results": analysis_results,
+                    "current_stage": "matching",
+                }
+            )
+            mark_stage("matching")
+        else:
             # Extract resume information
             extracted_data = await self.extractor.run(
-                [{"role": "user", "content": str(resume_data)}]
+                [{"role": "user", "content": resume_data}]
             )
             workflow_context.update(
                 {"extracted_data": extracted_data, "current_stage": "analysis"}
             )
+            mark_stage("analysis")
 
             # Analyze candidate profile
             analysis_results = await self.analyzer.run(
-                [{"role": "user", "content": str(extracted_data)}]
+                [{"role": "user", "content": str(_without_raw_text(extracted_data))}]
             )
             workflow_context.update(
                 {"analysis_results": analysis_results, "current_stage": "matching"}
             )
+            mark_stage("matching")
+
+        # Match with jobs
+        job_matches = await self.matcher.run(
+            [{"role": "user", "content": str(analysis_results)}]
+        )
+        workflow_context.update(
+            {"job_matches": job_matches, "current_stage": "screening"}
+        )
+        mark_stage("screening")
 
-            # Match with jobs
-            job_matches = await self.matcher.run(
-                [{"role": "user", "content": str(analysis_results)}]
+        # Skip screening and recommendation when the profile clearly doesn't fit
+        analysis = analysis_results.get("analysis", {})
+        if isinstance(analysis, str):
+            # Results reused from before structured outputs
+            analysis = self._parse_json_safely(analysis)
+        exit_reason = self.short_circuit_rules.evaluate(analysis, job_matches)
+
+        if exit_reason:
+            logger.info(f"⏭️ Orchestrator: Stopping early: {exit_reason}")
+            screening_results, final_recommendation = templated_rejection(
+                exit_reason, analysis
             )
             workflow_context.update(
-                {"job_matches": job_matches, "current_stage": "screening"}
+                {
+                    "screening_results": screening_results,
+                    "final_recommendation": final_recommendation,
+                    "short_circuit_reason": exit_reason,
+                    "status": "completed",
+                }
             )
-
-            # Screen candidate
-            screening_results = await self.screener.run(
-                [{"role": "user", "content": str(workflow_context)}]
+        elif self.mode == "fused_full":
+            # Screen and recommend in a single call, next to the per-job screenings
+            decision, per_job = await asyncio.gather(
+                self.decider.run(
+                    [{"role": "user", "content": str(_stage_context(workflow_context))}]
+                ),
+                self._screen_matched_jobs(extracted_data, analysis, job_matches),
             )
             workflow_context.update(
                 {
-                    "screening_results": screening_results,
+                    "screening_results": {**decision["screening_results"], "per_job": per_job},
+                    "final_recommendation": decision["final_recommendation"],
+                    "status": "completed",
+                }
+            )
+        else:
+            # Screen candidate overall and against each top job, concurrently
+            screening_results, per_job = await asyncio.gather(
+                self.screener.run(
+                    [{"role": "user", "content": str(_stage_context(workflow_context))}]
+                ),
+                self._screen_matched_jobs(extracted_data, analysis, job_matches),
+            )
+            workflow_context.update(
+                {
+                    "screening_results": {**screening_results, "per_job": per_job},
                     "current_stage": "recommendation",
                 }
             )
+            mark_stage("recommendation")
 
             # Generate recommendations
             final_recommendation = await self.recommender.run(
-                [{"role": "user", "content": str(workflow_context)}]
+                [{"role": "user", "content": str(_stage_context(workflow_context))}]
             )
             workflow_context.update(
                 {"final_recommendation": final_recommendation, "status": "completed"}
             )
 
-            return workflow_context
+        # Stored copies leave out the resume text, the caller persists it once
+        if cache_key is not None:
+            self._store_cached_result(cache_key, _stage_context(workflow_context))
+        if self.near_duplicate_index is not None:
+            await self.matcher.async_db.run(
+                self.near_duplicate_index.add,
+                extracted_data["raw_text"],
+                _stage_context(workflow_context),
+                catalog_version,
+            )
 
-        except Exception as e:
-            workflow_context.update({"status": "failed", "error": str(e)})
-            raise
+        return workflow_context
+
+    def _partial_result(self, workflow_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark a result cut short by the deadline, keeping the stages that finished"""
+        completed = [stage for stage in PIPELINE_STAGES if stage in workflow_context]
+        logger.warning(
+            f"⏱️ Orchestrator: Deadline reached during {workflow_context['current_stage']}, "
+            f"returning {len(completed)} completed stages"
+        )
+        workflow_context.update(
+            {
+                "status": "partial",
+                "completed_stages": completed,
+                "error": f"Deadline reached during {workflow_context['current_stage']}",
+            }
+        )
+        # Partial results aren't cached, so a resubmission gets a full run
+        return workflow_context
+
+    async def _screen_matched_jobs(
+        self,
+        extracted_data: Dict[str, Any],
+        analysis: Dict[str, Any],
+        job_matches: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Per-job screening reports for the top matches, each prompt holding one job"""
+        matches = job_matches.get("matches") or []
+        job_ids = list(dict.fromkeys(m["job_id"] for m in matches if m.get("job_id") is not None))
+        found = await asyncio.gather(*(self.matcher.async_db.get_job(job_id) for job_id in job_ids))
+        jobs = {job_id: job for job_id, job in zip(job_ids, found) if job is not None}
+        profile = {
+            "structured_data": extracted_data.get("structured_data"),
+            "analysis": analysis,
+        }
+        return await self.screener.screen_jobs(profile, matches, jobs)
+
+    def _claim(
+        self, key: Tuple[str, str]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Future], bool]:
+        """Look up a cached result, else join or start the in-flight computation.
+
+        Returns (cached result, in-flight future, whether the caller computes it).
+        Checked under one lock, and results are cached before their in-flight
+        entry is dropped, so an identical request always finds one or the other.
+        """
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+                return {**cached, "cache_hit": True}, None, False
+            if key in self._in_flight:
+                return None, self._in_flight[key], False
+            future = self._in_flight[key] = Future()
+            return None, future, True
+
+    def _store_cached_result(self, key: Tuple[str, str], result: Dict[str, Any]):
+        """Cache a completed result, evicting the least recently used entries"""
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
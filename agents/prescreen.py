@@ -0,0 +1,131 @@
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import os
+
+
+def _parse_matches(matches: Any) -> List[Dict[str, Any]]:
+    """Parse the matcher's JSON array output, tolerating surrounding prose"""
+    if isinstance(matches, list):
+        return matches
+    text = str(matches)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end == -1:
+        return []
+    try:
+        parsed = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _optional_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+class ShortCircuitRules:
+    """Rules that end an application after matching, skipping screening and recommendation.
+
+    Configured from the environment:
+    - EARLY_EXIT_ON_NO_MATCHES: stop when the matcher returns no positions (default true)
+    - EARLY_EXIT_MIN_LOCAL_SCORE: stop when the best local skill-overlap score is lower
+    - EARLY_EXIT_MIN_MATCH_SCORE: stop when the best LLM match score is lower
+    - EARLY_EXIT_EXPERIENCE_LEVELS: comma-separated levels the candidate must have
+    """
+
+    def __init__(
+        self,
+        on_no_matches: Optional[bool] = None,
+        min_local_score: Optional[float] = None,
+        min_match_score: Optional[float] = None,
+        experience_levels: Optional[List[str]] = None,
+    ):
+        self.on_no_matches = (
+            on_no_matches
+            if on_no_matches is not None
+            else os.getenv("EARLY_EXIT_ON_NO_MATCHES", "true").lower() == "true"
+        )
+        self.min_local_score = (
+            min_local_score
+            if min_local_score is not None
+            else _optional_float("EARLY_EXIT_MIN_LOCAL_SCORE")
+        )
+        self.min_match_score = (
+            min_match_score
+            if min_match_score is not None
+            else _optional_float("EARLY_EXIT_MIN_MATCH_SCORE")
+        )
+        if experience_levels is None:
+            experience_levels = [
+                level.strip()
+                for level in os.getenv("EARLY_EXIT_EXPERIENCE_LEVELS", "").split(",")
+                if level.strip()
+            ]
+        self.experience_levels = [level.lower() for level in experience_levels]
+
+    def evaluate(self, analysis: Dict[str, Any], job_matches: Dict[str, Any]) -> Optional[str]:
+        """Return the reason to stop early, or None to continue the pipeline"""
+        if self.experience_levels:
+            level = str(analysis.get("experience_level", "")).lower()
+            if level not in self.experience_levels:
+                return f"Experience level '{analysis.get('experience_level', 'unknown')}' does not meet the required level"
+
+        top_local_score = job_matches.get("top_local_score")
+        if (
+            self.min_local_score is not None
+            and top_local_score is not None
+            and top_local_score < self.min_local_score
+        ):
+            return f"Best skill overlap with open positions is {top_local_score}%, below the {self.min_local_score}% threshold"
+
+        matches = _parse_matches(job_matches.get("matches"))
+        if self.on_no_matches and not matches:
+            return "No suitable positions found for this profile"
+
+        if self.min_match_score is not None and matches:
+            top_score = max(float(m.get("match_score") or 0) for m in matches)
+            if top_score < self.min_match_score:
+                return f"Best match score is {top_score}%, below the {self.min_match_score}% threshold"
+
+        return None
+
+
+def templated_rejection(reason: str, analysis: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Screening and recommendation results for an application stopped early"""
+    screening_report = {
+        "qualification_alignment": {"score": 0, "analysis": reason},
+        "experience_relevance": {"score": 0, "analysis": reason},
+        "skill_match": {
+            "score": 0,
+            "strengths": analysis.get("technical_skills", []),
+            "gaps": [],
+        },
+        "cultural_fit": {"indicators": [], "concerns": []},
+        "red_flags": [],
+        "overall_recommendation": reason,
+    }
+    recommendation = {
+        "summary": {
+            "candidate_strengths": analysis.get("technical_skills", []),
+            "development_areas": [],
+            "best_fit_roles": [],
+        },
+        "recommendations": {
+            "immediate_next_steps": [
+                "Notify the candidate that no open position currently fits their profile",
+                "Keep the profile on file for future openings",
+            ],
+            "long_term_development": [],
+            "suggested_resources": [],
+        },
+        "hiring_recommendation": {
+            "decision": "Do Not Recommend",
+            "rationale": reason,
+            "suggested_compensation_range": "N/A",
+            "potential_growth_path": "N/A",
+        },
+    }
+    return (
+        {"screening_report": screening_report, "screening_status": "skipped"},
+        {"final_recommendation": recommendation, "recommendation_status": "skipped"},
+    )
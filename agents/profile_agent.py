@@ -0,0 +1,64 @@
+from typing import Dict, Any
+import asyncio
+import logging
+from .extractor_agent import ExtractorAgent
+from .analyzer_agent import ANALYSIS_FORMAT
+from .model_config import get_model_settings
+from .schemas import PROFILE_SCHEMA
+from utils.exceptions import AnalysisError
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileAgent(ExtractorAgent):
+    """Extraction and analysis in a single LLM call"""
+
+    output_schema = PROFILE_SCHEMA
+    error_class = AnalysisError
+
+    def __init__(self):
+        super().__init__()
+        self.name = "Profile"
+        self.instructions = """Extract and structure information from resumes, then analyze the candidate profile.
+            Focus on: personal info, work experience, education, skills, and certifications.
+            Assess technical skills, years of experience, education level, experience level,
+            key achievements and domain expertise.
+            Provide output as a single JSON object."""
+        self.model_settings = get_model_settings(self.name)
+
+    async def run(self, messages: list) -> Dict[str, Any]:
+        """Extract and analyze the resume in one round-trip"""
+        logger.info("📄 Profile: Extracting and analyzing resume")
+
+        content = messages[-1]["content"]
+        resume_data = content if isinstance(content, dict) else eval(content)
+
+        loaded = await asyncio.to_thread(self.load_resume_text, resume_data)
+        raw_text = loaded["raw_text"]
+
+        profile_prompt = f"""
+        Extract the information in this resume and analyze the candidate.
+        Return a JSON object with exactly two keys:
+        - "structured_data": personal info, work experience, education, skills and certifications
+        - "analysis": an object with this structure:
+        {ANALYSIS_FORMAT}
+
+        Resume:
+        {raw_text}
+        """
+
+        profile = await asyncio.to_thread(self._query_structured, profile_prompt)
+
+        return {
+            "extracted_data": {
+                "raw_text": raw_text,
+                "structured_data": profile["structured_data"],
+                "extraction_stats": loaded["extraction_stats"],
+                "compaction_stats": loaded["compaction_stats"],
+                "extraction_status": "completed",
+            },
+            "analysis_results": {
+                "analysis": profile["analysis"],
+                "analysis_status": "completed",
+            },
+        }
@@ -1,8 +1,38 @@
 from typing import Dict, Any
+import asyncio
+import logging
 from .base_agent import BaseAgent
+from .schemas import RECOMMENDATION_SCHEMA
+from utils.exceptions import RecommendationError
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_FORMAT = """
+{
+    "summary": {
+        "candidate_strengths": ["string"],
+        "development_areas": ["string"],
+        "best_fit_roles": ["string"]
+    },
+    "recommendations": {
+        "immediate_next_steps": ["string"],
+        "long_term_development": ["string"],
+        "suggested_resources": ["string"]
+    },
+    "hiring_recommendation": {
+        "decision": "Strongly Recommend/Recommend/Consider/Do Not Recommend",
+        "rationale": "string",
+        "suggested_compensation_range": "string",
+        "potential_growth_path": "string"
+    }
+}
+"""
 
 
 class RecommenderAgent(BaseAgent):
+    output_schema = RECOMMENDATION_SCHEMA
+    error_class = RecommendationError
+
     def __init__(self):
         super().__init__(
             name="Recommender",
@@ -16,7 +46,7 @@ class RecommenderAgent(BaseAgent):
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Generate final recommendations"""
-        print("💡 Recommender: Generating final recommendations")
+        logger.info("💡 Recommender: Generating final recommendations")
 
         workflow_context = eval(messages[-1]["content"])
         
@@ -27,27 +57,10 @@ class RecommenderAgent(BaseAgent):
         {workflow_context}
         
         Return a JSON object with this structure:
-        {{
-            "summary": {{
-                "candidate_strengths": ["string"],
-                "development_areas": ["string"],
-                "best_fit_roles": ["string"]
-            }},
-            "recommendations": {{
-                "immediate_next_steps": ["string"],
-                "long_term_development": ["string"],
-                "suggested_resources": ["string"]
-            }},
-            "hiring_recommendation": {{
-                "decision": "Strongly Recommend/Recommend/Consider/Do Not Recommend",
-                "rationale": "string",
-                "suggested_compensation_range": "string",
-                "potential_growth_path": "string"
-            }}
-        }}
+        {RECOMMENDATION_FORMAT}
         """
         
-        recommendation = self._query_openai(recommendation_prompt)
+        recommendation = await asyncio.to_thread(self._query_structured, recommendation_prompt)
 
         return {
             "final_recommendation": recommendation,
@@ -0,0 +1,177 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+# Lane of the calling context, so agents don't need to be told who they serve
+_lane = contextvars.ContextVar("llm_lane", default=INTERACTIVE)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+@contextmanager
+def llm_lane(lane: str):
+    """Send all LLM calls made inside the block through `lane`"""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    """Parse "interactive:4,batch:1" into lane weights"""
+    weights = {}
+    for item in value.split(","):
+        if item.strip():
+            lane, weight = item.split(":")
+            weights[lane.strip()] = float(weight)
+    return weights
+
+
+class LLMScheduler:
+    """Bounded concurrency for outbound LLM calls, shared by priority lanes.
+
+    Free slots go to the waiting lane that has received the least service
+    relative to its weight (stride scheduling), so a deep batch backlog can't
+    starve interactive requests. On top of that, `reserved_interactive` slots
+    are never handed to other lanes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        reserved_interactive: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.weights = weights or _parse_weights(
+            os.getenv("LLM_LANE_WEIGHTS", f"{INTERACTIVE}:4,{BATCH}:1")
+        )
+        self.weights.setdefault(INTERACTIVE, 1.0)
+        self.weights.setdefault(BATCH, 1.0)
+        if reserved_interactive is None:
+            reserved_interactive = int(os.getenv("LLM_INTERACTIVE_RESERVED", "2"))
+        # Other lanes always keep at least one slot
+        self.reserved_interactive = max(0, min(reserved_interactive, self.max_concurrency - 1))
+
+        self._cond = threading.Condition()
+        self._queues = {lane: deque() for lane in self.weights}
+        self._pass = {lane: 0.0 for lane in self.weights}
+        self._virtual_time = 0.0
+        self._in_flight = {lane: 0 for lane in self.weights}
+        self._stats = {
+            lane: {"completed": 0, "total_wait": 0.0, "max_wait": 0.0} for lane in self.weights
+        }
+
+    def _can_start(self, lane: str) -> bool:
+        if sum(self._in_flight.values()) >= self.max_concurrency:
+            return False
+        if lane == INTERACTIVE:
+            return True
+        others = sum(n for l, n in self._in_flight.items() if l != INTERACTIVE)
+        return others < self.max_concurrency - self.reserved_interactive
+
+    def _dispatch(self):
+        """Grant free slots to waiting requests (called with the lock held)"""
+        granted = False
+        while True:
+            ready = [lane for lane, q in self._queues.items() if q and self._can_start(lane)]
+            if not ready:
+                break
+            lane = min(ready, key=lambda l: self._pass[l])
+            ticket = self._queues[lane].popleft()
+            ticket["granted"] = True
+            self._in_flight[lane] += 1
+            self._virtual_time = self._pass[lane]
+            self._pass[lane] += 1.0 / self.weights[lane]
+
+            wait = time.monotonic() - ticket["enqueued"]
+            stats = self._stats[lane]
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, lane: Optional[str] = None, timeout: Optional[float] = None):
+        """Hold one concurrency slot in `lane` (default: the context's lane).
+
+        Raises TimeoutError if no slot is granted within `timeout` seconds.
+        """
+        lane = lane or current_lane()
+        if lane not in self._queues:
+            raise ValueError(f"Unknown LLM lane '{lane}', expected one of {list(self._queues)}")
+
+        ticket = {"granted": False, "enqueued": time.monotonic()}
+        with self._cond:
+            if not self._queues[lane]:
+                # An idle lane resumes at the current virtual time instead of
+                # cashing in the service it didn't ask for
+                self._pass[lane] = max(self._pass[lane], self._virtual_time)
+            self._queues[lane].append(ticket)
+            self._dispatch()
+            try:
+                give_up_at = None if timeout is None else ticket["enqueued"] + timeout
+                while not ticket["granted"]:
+                    wait = None if give_up_at is None else give_up_at - time.monotonic()
+                    if wait is not None and wait <= 0:
+                        raise TimeoutError(f"No LLM slot free in the '{lane}' lane within {timeout:.1f}s")
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket["granted"]:
+                    self._release(lane)
+                else:
+                    self._queues[lane].remove(ticket)
+                raise
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._stats[lane]["completed"] += 1
+                self._release(lane)
+
+    def _release(self, lane: str):
+        self._in_flight[lane] -= 1
+        self._dispatch()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, in-flight calls and wait times per lane"""
+        now = time.monotonic()
+        with self._cond:
+            metrics = {}
+            for lane, queue in self._queues.items():
+                stats = self._stats[lane]
+                granted = stats["completed"] + self._in_flight[lane]
+                metrics[lane] = {
+                    "weight": self.weights[lane],
+                    "queue_depth": len(queue),
+                    "in_flight": self._in_flight[lane],
+                    "completed": stats["completed"],
+                    "avg_wait_seconds": round(stats["total_wait"] / granted, 3) if granted else 0.0,
+                    "max_wait_seconds": round(stats["max_wait"], 3),
+                    "oldest_waiting_seconds": round(now - queue[0]["enqueued"], 3) if queue else 0.0,
+                }
+            return metrics
+
+
+def get_scheduler() -> LLMScheduler:
+    """Scheduler shared by all agents in this process"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
@@ -0,0 +1,243 @@
+from typing import Dict, Any, List, Optional, Tuple
+import json
+
+# Output schemas for each agent, in the JSON Schema subset understood by
+# OpenAI function calling and by validate() below.
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_SCORE = {"type": "number", "minimum": 0, "maximum": 100}
+
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "personal_info": {
+            "type": "object",
+            "properties": {
+                "name": {"type": ["string", "null"]},
+                "email": {"type": ["string", "null"]},
+                "phone": {"type": ["string", "null"]},
+                "location": {"type": ["string", "null"]},
+            },
+        },
+        "work_experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "company": {"type": "string"},
+                    "duration": {"type": "string"},
+                    "highlights": _STRING_LIST,
+                },
+            },
+        },
+        "education": {"type": "array", "items": {"type": "object"}},
+        "skills": _STRING_LIST,
+        "certifications": _STRING_LIST,
+    },
+    "required": ["personal_info", "work_experience", "education", "skills", "certifications"],
+}
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "technical_skills": _STRING_LIST,
+        "years_of_experience": {"type": "number"},
+        "education_level": {"type": "string"},
+        "experience_level": {"type": "string"},
+        "key_achievements": _STRING_LIST,
+        "domain_expertise": _STRING_LIST,
+    },
+    "required": [
+        "technical_skills",
+        "years_of_experience",
+        "education_level",
+        "experience_level",
+        "key_achievements",
+        "domain_expertise",
+    ],
+}
+
+MATCHES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "matches": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": ["string", "integer"]},
+                    "match_score": _SCORE,
+                    "reasoning": {"type": "string"},
+                    "key_matches": _STRING_LIST,
+                    "gaps": _STRING_LIST,
+                },
+                "required": ["job_id", "match_score", "reasoning", "key_matches", "gaps"],
+            },
+        }
+    },
+    "required": ["matches"],
+}
+
+CANDIDATE_RANKING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "candidates": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "application_id": {"type": ["string", "integer"]},
+                    "match_score": _SCORE,
+                    "reasoning": {"type": "string"},
+                    "key_matches": _STRING_LIST,
+                    "gaps": _STRING_LIST,
+                },
+                "required": ["application_id", "match_score", "reasoning", "key_matches", "gaps"],
+            },
+        }
+    },
+    "required": ["candidates"],
+}
+
+SCREENING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "qualification_alignment": {
+            "type": "object",
+            "properties": {"score": _SCORE, "analysis": {"type": "string"}},
+            "required": ["score", "analysis"],
+        },
+        "experience_relevance": {
+            "type": "object",
+            "properties": {"score": _SCORE, "analysis": {"type": "string"}},
+            "required": ["score", "analysis"],
+        },
+        "skill_match": {
+            "type": "object",
+            "properties": {"score": _SCORE, "strengths": _STRING_LIST, "gaps": _STRING_LIST},
+            "required": ["score", "strengths", "gaps"],
+        },
+        "cultural_fit": {
+            "type": "object",
+            "properties": {"indicators": _STRING_LIST, "concerns": _STRING_LIST},
+            "required": ["indicators", "concerns"],
+        },
+        "red_flags": _STRING_LIST,
+        "overall_recommendation": {"type": "string"},
+    },
+    "required": [
+        "qualification_alignment",
+        "experience_relevance",
+        "skill_match",
+        "cultural_fit",
+        "red_flags",
+        "overall_recommendation",
+    ],
+}
+
+RECOMMENDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "object",
+            "properties": {
+                "candidate_strengths": _STRING_LIST,
+                "development_areas": _STRING_LIST,
+                "best_fit_roles": _STRING_LIST,
+            },
+            "required": ["candidate_strengths", "development_areas", "best_fit_roles"],
+        },
+        "recommendations": {
+            "type": "object",
+            "properties": {
+                "immediate_next_steps": _STRING_LIST,
+                "long_term_development": _STRING_LIST,
+                "suggested_resources": _STRING_LIST,
+            },
+            "required": ["immediate_next_steps", "long_term_development", "suggested_resources"],
+        },
+        "hiring_recommendation": {
+            "type": "object",
+            "properties": {
+                "decision": {
+                    "type": "string",
+                    "enum": ["Strongly Recommend", "Recommend", "Consider", "Do Not Recommend"],
+                },
+                "rationale": {"type": "string"},
+                "suggested_compensation_range": {"type": "string"},
+                "potential_growth_path": {"type": "string"},
+            },
+            "required": [
+                "decision",
+                "rationale",
+                "suggested_compensation_range",
+                "potential_growth_path",
+            ],
+        },
+    },
+    "required": ["summary", "recommendations", "hiring_recommendation"],
+}
+
+PROFILE_SCHEMA = {
+    "type": "object",
+    "properties": {"structured_data": EXTRACTION_SCHEMA, "analysis": ANALYSIS_SCHEMA},
+    "required": ["structured_data", "analysis"],
+}
+
+DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "screening_report": SCREENING_SCHEMA,
+        "final_recommendation": RECOMMENDATION_SCHEMA,
+    },
+    "required": ["screening_report", "final_recommendation"],
+}
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def validate(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Check `data` against `schema`, returning a list of human-readable errors"""
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPE_CHECKS[t](data) for t in types):
+            return [f"{path}: expected {' or '.join(types)}, got {type(data).__name__}"]
+
+    errors = []
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: {data!r} is not one of {schema['enum']}")
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        if "minimum" in schema and data < schema["minimum"]:
+            errors.append(f"{path}: {data} is below {schema['minimum']}")
+        if "maximum" in schema and data > schema["maximum"]:
+            errors.append(f"{path}: {data} is above {schema['maximum']}")
+    if isinstance(data, dict):
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path}: missing required field '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in data:
+                errors.extend(validate(data[key], subschema, f"{path}.{key}"))
+    if isinstance(data, list) and "items" in schema:
+        for i, item in enumerate(data):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def parse_structured(text: str, schema: Dict[str, Any]) -> Tuple[Optional[Any], List[str]]:
+    """Strictly parse model output as JSON and validate it against `schema`"""
+    try:
+        data = json.loads(text)
+    except (TypeError, json.JSONDecodeError) as e:
+        return None, [f"$: output is not valid JSON ({str(e)})"]
+    return data, validate(data, schema)
@@ -1,8 +1,43 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
+import asyncio
+import heapq
+import logging
+import os
 from .base_agent import BaseAgent
+from .schemas import SCREENING_SCHEMA
+from utils.exceptions import ScreeningError
+
+logger = logging.getLogger(__name__)
+
+SCREENING_FORMAT = """
+{
+    "qualification_alignment": {
+        "score": number (0-100),
+        "analysis": "string"
+    },
+    "experience_relevance": {
+        "score": number (0-100),
+        "analysis": "string"
+    },
+    "skill_match": {
+        "score": number (0-100),
+        "strengths": ["string"],
+        "gaps": ["string"]
+    },
+    "cultural_fit": {
+        "indicators": ["string"],
+        "concerns": ["string"]
+    },
+    "red_flags": ["string"] or [],
+    "overall_recommendation": "string"
+}
+"""
 
 
 class ScreenerAgent(BaseAgent):
+    output_schema = SCREENING_SCHEMA
+    error_class = ScreeningError
+
     def __init__(self):
         super().__init__(
             name="Screener",
@@ -14,10 +49,12 @@ class ScreenerAgent(BaseAgent):
             - Red flags or concerns
             Provide comprehensive screening reports.""",
         )
+        # Matched jobs that each get their own screening report
+        self.per_job_top_n = int(os.getenv("SCREEN_PER_JOB_TOP_N", "3"))
 
     async def run(self, messages: list) -> Dict[str, Any]:
         """Screen the candidate"""
-        print("👥 Screener: Conducting initial screening")
+        logger.info("👥 Screener: Conducting initial screening")
 
         workflow_context = eval(messages[-1]["content"])
         
@@ -28,32 +65,72 @@ class ScreenerAgent(BaseAgent):
         {workflow_context}
         
         Return a JSON object with this structure:
-        {{
-            "qualification_alignment": {{
-                "score": number (0-100),
-                "analysis": "string"
-            }},
-            "experience_relevance": {{
-                "score": number (0-100),
-                "analysis": "string"
-            }},
-            "skill_match": {{
-                "score": number (0-100),
-                "strengths": ["string"],
-                "gaps": ["string"]
-            }},
-            "cultural_fit": {{
-                "indicators": ["string"],
-                "concerns": ["string"]
-            }},
-            "red_flags": ["string"] or [],
-            "overall_recommendation": "string"
-        }}
+        {SCREENING_FORMAT}
         """
         
-        screening_results = self._query_openai(screening_prompt)
+        # Off the event loop, so per-job screenings run alongside it
+        screening_results = await asyncio.to_thread(self._query_structured, screening_prompt)
 
         return {
             "screening_report": screening_results,
             "screening_status": "completed"
         }
+
+    async def screen_jobs(
+        self,
+        profile: Dict[str, Any],
+        job_matches: List[Dict[str, Any]],
+        jobs: Dict[int, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Screen the candidate against each of the top matched jobs concurrently"""
+        top_matches = heapq.nlargest(
+            self.per_job_top_n,
+            [match for match in job_matches if match.get("job_id") in jobs],
+            key=lambda match: match.get("match_score") or 0,
+        )
+        if not top_matches:
+            return []
+        logger.info(f"👥 Screener: Screening against {len(top_matches)} matched jobs")
+
+        reports = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self._query_structured,
+                    self._job_screening_prompt(profile, jobs[match["job_id"]], match),
+                )
+                for match in top_matches
+            )
+        )
+        return [
+            {
+                "job_id": match["job_id"],
+                "job_title": jobs[match["job_id"]].get("title"),
+                "company": jobs[match["job_id"]].get("company"),
+                "match_score": match.get("match_score"),
+                "screening_report": report,
+            }
+            for match, report in zip(top_matches, reports)
+        ]
+
+    def _job_screening_prompt(
+        self, profile: Dict[str, Any], job: Dict[str, Any], match: Dict[str, Any]
+    ) -> str:
+        job_summary = {
+            key: job.get(key)
+            for key in ("title", "company", "experience_level", "description", "requirements")
+        }
+        return f"""
+        Screen the candidate for this one position only.
+
+        Position:
+        {job_summary}
+
+        Match assessment:
+        {{"match_score": {match.get("match_score")}, "key_matches": {match.get("key_matches", [])}, "gaps": {match.get("gaps", [])}}}
+
+        Candidate profile:
+        {profile}
+
+        Return a JSON object with this structure:
+        {SCREENING_FORMAT}
+        """
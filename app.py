@@ -1,10 +1,17 @@
 import streamlit as st
 import asyncio
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from pathlib import Path
+from typing import Optional
 from streamlit_option_menu import option_menu
 from agents.orchestrator import OrchestratorAgent
+from agents.scheduler import BATCH, get_scheduler, llm_lane
+from db.database import JobDatabase
+from db.result_store import ResultStore
 from utils.logger import setup_logger
 from utils.exceptions import ResumeProcessingError
 
@@ -19,38 +26,535 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-async def process_resume(file_path: str) -> dict:
-    """Process resume through the AI recruitment pipeline"""
+# Number of resumes processed at once in a multi-file upload
+MAX_CONCURRENT_APPLICATIONS = int(os.getenv("MAX_CONCURRENT_APPLICATIONS", "4"))
+
+# Deadline of each application in a multi-file upload, which queues behind
+# interactive uploads; single uploads use APPLICATION_DEADLINE_SECONDS
+BATCH_APPLICATION_DEADLINE = float(os.getenv("BATCH_APPLICATION_DEADLINE_SECONDS", "600"))
+
+# Seconds before the analytics rollups are re-read
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "300"))
+
+@st.cache_resource
+def get_orchestrator() -> OrchestratorAgent:
+    """One orchestrator and agent set per process, reused across reruns"""
+    return OrchestratorAgent()
+
+def profiling_requested() -> bool:
+    """Whether the page was opened with ?profile=1"""
+    return st.query_params.get("profile") in ("1", "true")
+
+def run_async(coro):
+    """Run a coroutine to completion without waiting on its abandoned worker threads.
+
+    asyncio.run() joins every to_thread call on exit, so a stage cut off at
+    the deadline would still hold up the page until it finished.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        # Shuts the default executor down without waiting
+        loop.close()
+
+async def process_resume(
+    file_content: memoryview,
+    file_name: str,
+    profile: bool = False,
+    deadline_seconds: Optional[float] = None,
+) -> dict:
+    """Process an in-memory resume through the AI recruitment pipeline"""
     try:
-        orchestrator = OrchestratorAgent()
+        orchestrator = get_orchestrator()
         resume_data = {
-            "file_path": file_path,
+            "file_name": file_name,
+            "file_content": file_content,
+            "content_hash": hashlib.sha256(file_content).hexdigest(),
             "submission_timestamp": datetime.now().isoformat(),
+            "profile": profile,
+            # None falls back to APPLICATION_DEADLINE_SECONDS
+            "deadline_seconds": deadline_seconds,
         }
         return await orchestrator.process_application(resume_data)
     except Exception as e:
         logger.error(f"Error processing resume: {str(e)}")
         raise
 
-def save_uploaded_file(uploaded_file) -> str:
-    """Save uploaded file and return the file path"""
-    try:
-        # Create uploads directory if it doesn't exist
-        save_dir = Path("uploads")
-        save_dir.mkdir(exist_ok=True)
+@st.cache_resource
+def get_job_database() -> JobDatabase:
+    """Shared database handle for dashboard queries and saved results"""
+    return JobDatabase()
 
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_path = save_dir / f"resume_{timestamp}_{uploaded_file.name}"
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """Process-wide append-only store for completed analyses"""
+    return ResultStore("results")
 
-        # Save the file
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+@st.cache_data(ttl=ANALYTICS_CACHE_TTL, show_spinner=False)
+def load_analytics() -> dict:
+    """Load the analytics rollups as DataFrames"""
+    import pandas as pd
+
+    db = get_job_database()
+    return {
+        "scores": pd.DataFrame(
+            db.get_score_distribution(), columns=["score_type", "bucket", "total"]
+        ),
+        "decisions": pd.DataFrame(db.get_decision_mix(), columns=["decision", "total"]),
+        "skill_gaps": pd.DataFrame(db.get_top_skill_gaps(), columns=["skill", "total"]),
+        "throughput": pd.DataFrame(db.get_daily_throughput(), columns=["day", "total"]),
+        "loaded_at": datetime.now(),
+    }
+
+def render_candidate_search():
+    """Rank already-processed candidates for an open position"""
+    st.header("🔎 Find Candidates")
+    st.write("Rank previously analyzed candidates against a job without reprocessing them.")
+
+    jobs = get_job_database().get_all_jobs()
+    if not jobs:
+        st.info("No jobs in the catalog yet.")
+        return
+
+    job = st.selectbox(
+        "Job", jobs, format_func=lambda j: f"{j['title']} · {j['company']} ({j['experience_level']})"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        k = st.slider("Candidates to show", 5, 100, 20)
+    with col2:
+        explain_top = st.slider("Explain the top candidates with AI", 0, 10, 0)
+
+    if st.button("Rank candidates"):
+        import pandas as pd
+
+        try:
+            with st.spinner("Ranking candidates..."):
+                ranked = get_orchestrator().matcher.rank_candidates_for_job(
+                    job["id"], k=k, explain_top=explain_top
+                )
+        except Exception as e:
+            st.error(f"Error ranking candidates: {str(e)}")
+            logger.error(f"Error ranking candidates: {str(e)}")
+            return
+
+        if not ranked:
+            st.info("No analyzed candidates yet.")
+            return
+
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Candidate": c.get("name") or f"Application {c['application_id']}",
+                        "Experience": c["experience_level"],
+                        "Score": c["local_score"],
+                        "Skills": c["skill_score"],
+                        "AI Score": c.get("match_score"),
+                    }
+                    for c in ranked
+                ]
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+        for c in ranked:
+            if c.get("reasoning"):
+                with st.expander(c.get("name") or f"Application {c['application_id']}"):
+                    st.write(c["reasoning"])
+                    st.write("**Key matches:** " + ", ".join(c["key_matches"]))
+                    st.write("**Gaps:** " + ", ".join(c["gaps"]))
 
-        return str(file_path)
+def render_analytics():
+    """Render the analytics dashboard from the cached rollups"""
+    st.header("📈 Analytics")
+
+    if st.button("Refresh data"):
+        load_analytics.clear()
+
+    try:
+        data = load_analytics()
     except Exception as e:
-        st.error(f"Error saving file: {str(e)}")
+        st.error(f"Error loading analytics: {str(e)}")
+        logger.error(f"Error loading analytics: {str(e)}")
+        return
+
+    st.caption(f"Data as of {data['loaded_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Applications (90 days)", int(data["throughput"]["total"].sum()))
+    with col2:
+        st.metric("Recommendations", int(data["decisions"]["total"].sum()))
+    with col3:
+        matches = data["scores"][data["scores"]["score_type"] == "match"]
+        st.metric("Job Matches", int(matches["total"].sum()))
+
+    st.subheader("Score Distribution")
+    if data["scores"].empty:
+        st.info("No scores recorded yet.")
+    else:
+        scores = data["scores"].pivot_table(
+            index="bucket", columns="score_type", values="total", fill_value=0
+        )
+        st.bar_chart(scores)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Hiring Decisions")
+        if data["decisions"].empty:
+            st.info("No recommendations recorded yet.")
+        else:
+            st.bar_chart(data["decisions"].set_index("decision"))
+    with col2:
+        st.subheader("Most Common Skill Gaps")
+        if data["skill_gaps"].empty:
+            st.info("No skill gaps recorded yet.")
+        else:
+            st.dataframe(data["skill_gaps"], hide_index=True, use_container_width=True)
+
+    st.subheader("Applications per Day")
+    if data["throughput"].empty:
+        st.info("No applications in the last 90 days.")
+    else:
+        st.line_chart(data["throughput"].set_index("day"))
+
+    import pandas as pd
+
+    # Live, not cached: queue state changes by the second
+    st.subheader("LLM Queue")
+    st.dataframe(
+        pd.DataFrame.from_dict(get_scheduler().metrics(), orient="index").rename_axis("lane"),
+        use_container_width=True,
+    )
+
+def _stage_output(value):
+    """Stage outputs are parsed by the agents; older cached results hold JSON strings"""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def parse_result(result: dict) -> dict:
+    """Collect the validated output of each stage; stages a partial result lacks are None"""
+
+    def stage(name: str, key: str):
+        return _stage_output(result[name][key]) if name in result else None
+
+    return {
+        "analysis": stage("analysis_results", "analysis"),
+        "matches": stage("job_matches", "matches"),
+        "screening": stage("screening_results", "screening_report"),
+        # Absent from results cached before per-job screening and from early exits
+        "per_job_screening": result.get("screening_results", {}).get("per_job", []),
+        "recommendation": stage("final_recommendation", "final_recommendation"),
+    }
+
+STAGE_NOT_REACHED = "This stage didn't finish before the application's deadline."
+
+def render_result_tabs(parsed: dict):
+    """Render parsed pipeline results as tabs"""
+    # Display results in tabs
+    tab1, tab2, tab3, tab4 = st.tabs(
+        [
+            "📊 Analysis",
+            "💼 Job Matches",
+            "🎯 Screening",
+            "💡 Recommendation",
+        ]
+    )
+
+    with tab1:
+        st.subheader("Skills Analysis")
+        if parsed["analysis"] is None:
+            st.info(STAGE_NOT_REACHED)
+        else:
+            analysis = parsed["analysis"]
+        
+            # Display technical skills
+            st.write("**Technical Skills:**")
+            if "technical_skills" in analysis:
+                for skill in analysis["technical_skills"]:
+                    st.write(f"- {skill}")
+        
+            # Display experience level
+            if "experience_level" in analysis:
+                st.metric("Experience Level", analysis["experience_level"])
+        
+            # Display education
+            if "education_level" in analysis:
+                st.metric("Education Level", analysis["education_level"])
+
+    with tab2:
+        st.subheader("Matched Positions")
+        if parsed["matches"] is None:
+            st.info(STAGE_NOT_REACHED)
+        else:
+            matches = parsed["matches"]
+        
+            if not matches:
+                st.warning("No suitable positions found.")
+            else:
+                for match in matches:
+                    with st.container():
+                        col1, col2 = st.columns([2, 1])
+                        with col1:
+                            st.write(f"**Job ID:** {match['job_id']}")
+                            st.write(f"**Reasoning:** {match['reasoning']}")
+                            st.write("**Key Matches:**")
+                            for skill in match['key_matches']:
+                                st.write(f"- {skill}")
+                        with col2:
+                            st.metric("Match Score", f"{match['match_score']}%")
+                            if match.get('gaps'):
+                                st.write("**Skill Gaps:**")
+                                for gap in match['gaps']:
+                                    st.write(f"- {gap}")
+                    st.divider()
+
+    with tab3:
+        st.subheader("Screening Results")
+        if parsed["screening"] is None:
+            st.info(STAGE_NOT_REACHED)
+        else:
+            screening = parsed["screening"]
+        
+            # Display qualification alignment
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Qualification Score", 
+                        f"{screening['qualification_alignment']['score']}%")
+                st.write(screening['qualification_alignment']['analysis'])
+            with col2:
+                st.metric("Experience Score", 
+                        f"{screening['experience_relevance']['score']}%")
+                st.write(screening['experience_relevance']['analysis'])
+        
+            # Display skill match
+            st.subheader("Skill Assessment")
+            st.metric("Skill Match Score", f"{screening['skill_match']['score']}%")
+            col3, col4 = st.columns(2)
+            with col3:
+                st.write("**Strengths:**")
+                for strength in screening['skill_match']['strengths']:
+                    st.write(f"- {strength}")
+            with col4:
+                st.write("**Areas for Development:**")
+                for gap in screening['skill_match']['gaps']:
+                    st.write(f"- {gap}")
+        
+            # Display red flags if any
+            if screening['red_flags']:
+                st.warning("**Potential Concerns:**")
+                for flag in screening['red_flags']:
+                    st.write(f"- {flag}")
+
+            # Display a screening per matched role
+            if parsed.get("per_job_screening"):
+                st.subheader("Screening by Role")
+                for job_screening in parsed["per_job_screening"]:
+                    report = job_screening["screening_report"]
+                    with st.expander(
+                        f"{job_screening['job_title']} at {job_screening['company']} "
+                        f"(match {job_screening['match_score']}%)"
+                    ):
+                        col5, col6, col7 = st.columns(3)
+                        col5.metric("Qualification", f"{report['qualification_alignment']['score']}%")
+                        col6.metric("Experience", f"{report['experience_relevance']['score']}%")
+                        col7.metric("Skill Match", f"{report['skill_match']['score']}%")
+                        st.write(report['overall_recommendation'])
+                        if report['skill_match']['gaps']:
+                            st.write("**Gaps for this role:**")
+                            for gap in report['skill_match']['gaps']:
+                                st.write(f"- {gap}")
+                        if report['red_flags']:
+                            st.warning("**Concerns:** " + "; ".join(report['red_flags']))
+
+    with tab4:
+        st.subheader("Final Recommendation")
+        if parsed["recommendation"] is None:
+            st.info(STAGE_NOT_REACHED)
+        else:
+            recommendation = parsed["recommendation"]
+        
+            # Display summary
+            st.write("### Summary")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Strengths:**")
+                for strength in recommendation['summary']['candidate_strengths']:
+                    st.write(f"- {strength}")
+            with col2:
+                st.write("**Development Areas:**")
+                for area in recommendation['summary']['development_areas']:
+                    st.write(f"- {area}")
+        
+            # Display hiring recommendation
+            st.write("### Hiring Recommendation")
+            decision = recommendation['hiring_recommendation']['decision']
+            if decision in ["Strongly Recommend", "Recommend"]:
+                st.success(decision)
+            elif decision == "Consider":
+                st.warning(decision)
+            else:
+                st.error(decision)
+            st.write(recommendation['hiring_recommendation']['rationale'])
+        
+            # Display next steps
+            st.write("### Next Steps")
+            for step in recommendation['recommendations']['immediate_next_steps']:
+                st.write(f"- {step}")
+
+def save_result(result: dict, parsed: dict, file_name: str) -> Optional[str]:
+    """Append a fresh result to the result store, and completed results to the database.
+
+    Streamlit reruns the script on every interaction, and reruns replay the
+    same upload from the result cache. Only fresh runs are saved, once per
+    session, so reruns don't add duplicate applications. Returns the result
+    store segment the result was saved to, or None if it wasn't saved.
+    """
+    # A partial result doesn't stop a later complete run of the same resume being saved
+    key = (result.get("resume_data", {}).get("content_hash"), result["status"])
+    saved = st.session_state.setdefault("saved_results", {})
+    if key in saved:
+        return saved[key]["segment"]
+    if result.get("cache_hit") or result.get("coalesced"):
+        # Replays of a run that was saved when it was fresh
+        return None
+
+    structured = result.get("extracted_data", {}).get("structured_data")
+    personal = structured.get("personal_info") or {} if isinstance(structured, dict) else {}
+    application_id = None
+    # The application tables need every stage, partial results are kept in the store only
+    if result["status"] == "completed":
+        try:
+            application_id = get_job_database().save_application_result(
+                {
+                    "name": personal.get("name"),
+                    "email": personal.get("email"),
+                    "phone": personal.get("phone"),
+                    "location": personal.get("location"),
+                    "resume_path": file_name,
+                    "raw_text": result["extracted_data"].get("raw_text"),
+                },
+                **parsed,
+            )
+        except Exception as e:
+            # The result store remains the record of the analysis
+            logger.error(f"Error saving application to database: {str(e)}")
+
+    # The store keeps per-job reports in the record's payload
+    stages = {k: v for k, v in parsed.items() if k != "per_job_screening"}
+    segment = get_result_store().append(
+        ResultStore.make_record(result, file_name=file_name, **stages)
+    )
+    if key[0]:
+        saved[key] = {"application_id": application_id, "segment": segment}
+    return segment
+
+def run_application(file_content: bytes, file_name: str, status: dict, profile: bool = False) -> dict:
+    """Run one application of a bulk upload to completion on a worker thread"""
+    status["Status"] = "Processing"
+    started = time.monotonic()
+    try:
+        # Bulk uploads yield LLM capacity to single interactive uploads
+        with llm_lane(BATCH):
+            result = run_async(
+                process_resume(file_content, file_name, profile, BATCH_APPLICATION_DEADLINE)
+            )
+        if result["status"] == "partial":
+            status["Status"] = "Partial"
+        elif result.get("cache_hit"):
+            status["Status"] = "Cached"
+        elif result.get("coalesced"):
+            # Shared the run of an identical upload in the same batch
+            status["Status"] = "Coalesced"
+        else:
+            status["Status"] = "Completed"
+        return result
+    except Exception:
+        status["Status"] = "Failed"
         raise
+    finally:
+        status["Seconds"] = round(time.monotonic() - started, 1)
+
+def process_batch(uploaded_files: list):
+    """Process several resumes concurrently with a live status table"""
+    import pandas as pd
+
+    st.info(
+        f"Processing {len(uploaded_files)} resumes, "
+        f"{MAX_CONCURRENT_APPLICATIONS} at a time..."
+    )
+    statuses = [
+        {"File": f.name, "Status": "Queued", "Seconds": None} for f in uploaded_files
+    ]
+    status_table = st.empty()
+    results = [None] * len(uploaded_files)
+    # Query params are only readable from the script thread
+    profile = profiling_requested()
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_APPLICATIONS) as pool:
+        futures = {
+            pool.submit(run_application, f.getvalue(), f.name, statuses[i], profile): i
+            for i, f in enumerate(uploaded_files)
+        }
+        pending = set(futures)
+        while pending:
+            status_table.dataframe(pd.DataFrame(statuses), hide_index=True, use_container_width=True)
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    statuses[index]["Error"] = str(e)
+                    logger.error(f"Error processing resume {uploaded_files[index].name}: {str(e)}")
+    status_table.dataframe(pd.DataFrame(statuses), hide_index=True, use_container_width=True)
+
+    # Parse and store the finished applications, then rank them
+    ranking = []
+    parsed_results = {}
+    for uploaded_file, result in zip(uploaded_files, results):
+        if not result or result["status"] not in ("completed", "partial"):
+            continue
+        try:
+            parsed = parse_result(result)
+            save_result(result, parsed, uploaded_file.name)
+        except Exception as e:
+            st.error(f"Error reading results for {uploaded_file.name}: {str(e)}")
+            logger.error(f"Error reading results for {uploaded_file.name}: {str(e)}")
+            continue
+        parsed_results[uploaded_file.name] = parsed
+        top_match = max(parsed["matches"] or [], key=lambda m: m.get("match_score") or 0, default={})
+        # Stages a partial result didn't reach are left blank
+        recommendation = parsed["recommendation"] or {}
+        screening = parsed["screening"] or {}
+        ranking.append(
+            {
+                "File": uploaded_file.name,
+                "Decision": recommendation.get("hiring_recommendation", {}).get("decision"),
+                "Top Match Score": top_match.get("match_score"),
+                "Top Job ID": top_match.get("job_id"),
+                "Skill Match Score": screening.get("skill_match", {}).get("score"),
+                "Qualification Score": screening.get("qualification_alignment", {}).get("score"),
+                "Experience Level": (parsed["analysis"] or {}).get("experience_level"),
+            }
+        )
+
+    if not ranking:
+        st.warning("No resumes were processed successfully.")
+        return
+
+    st.subheader("Candidate Ranking")
+    ranking_df = pd.DataFrame(ranking).sort_values(
+        ["Top Match Score", "Skill Match Score"], ascending=False, na_position="last"
+    )
+    st.dataframe(ranking_df, hide_index=True, use_container_width=True)
+
+    for file_name in ranking_df["File"]:
+        with st.expander(file_name):
+            render_result_tabs(parsed_results[file_name])
 
 def main():
     # Sidebar navigation
@@ -62,8 +566,8 @@ def main():
         st.title("AI Recruiter Agency")
         selected = option_menu(
             menu_title="Navigation",
-            options=["Upload Resume", "About"],
-            icons=["cloud-upload", "info-circle"],
+            options=["Upload Resume", "Find Candidates", "Analytics", "About"],
+            icons=["cloud-upload", "people", "bar-chart", "info-circle"],
             menu_icon="cast",
             default_index=0,
         )
@@ -72,17 +576,19 @@ def main():
         st.header("📄 Resume Analysis")
         st.write("Upload a resume to get AI-powered insights and job matches.")
 
-        uploaded_file = st.file_uploader(
-            "Choose a PDF resume file",
+        uploaded_files = st.file_uploader(
+            "Choose PDF resume files",
             type=["pdf"],
-            help="Upload a PDF resume to analyze",
+            accept_multiple_files=True,
+            help="Upload one or more PDF resumes to analyze",
         )
 
-        if uploaded_file:
-            try:
-                with st.spinner("Saving uploaded file..."):
-                    file_path = save_uploaded_file(uploaded_file)
+        if len(uploaded_files) > 1:
+            process_batch(uploaded_files)
 
+        elif uploaded_files:
+            uploaded_file = uploaded_files[0]
+            try:
                 st.info("Resume uploaded successfully! Processing...")
 
                 # Create placeholder for progress bar
@@ -95,161 +601,57 @@ def main():
                     progress_bar.progress(25)
 
                     # Run analysis asynchronously
-                    result = asyncio.run(process_resume(file_path))
+                    result = run_async(
+                        process_resume(
+                            uploaded_file.getbuffer(), uploaded_file.name, profiling_requested()
+                        )
+                    )
 
-                    if result["status"] == "completed":
+                    if result["status"] in ("completed", "partial"):
                         progress_bar.progress(100)
-                        status_text.text("Analysis complete!")
-
-                        # Display results in tabs
-                        tab1, tab2, tab3, tab4 = st.tabs(
-                            [
-                                "📊 Analysis",
-                                "💼 Job Matches",
-                                "🎯 Screening",
-                                "💡 Recommendation",
-                            ]
-                        )
+                        if result["status"] == "partial":
+                            status_text.text("Analysis stopped at the deadline")
+                            st.warning(
+                                f"Partial results: {result['error']}. "
+                                "Stages that didn't finish are marked below."
+                            )
+                        else:
+                            status_text.text("Analysis complete!")
+                        if result.get("short_circuit_reason"):
+                            st.info(
+                                f"Screening skipped: {result['short_circuit_reason']}"
+                            )
 
-                        with tab1:
-                            st.subheader("Skills Analysis")
-                            analysis = eval(result["analysis_results"]["analysis"])
-                            
-                            # Display technical skills
-                            st.write("**Technical Skills:**")
-                            if "technical_skills" in analysis:
-                                for skill in analysis["technical_skills"]:
-                                    st.write(f"- {skill}")
-                            
-                            # Display experience level
-                            if "experience_level" in analysis:
-                                st.metric("Experience Level", analysis["experience_level"])
-                            
-                            # Display education
-                            if "education_level" in analysis:
-                                st.metric("Education Level", analysis["education_level"])
-
-                        with tab2:
-                            st.subheader("Matched Positions")
-                            matches = eval(result["job_matches"]["matches"])
-                            
-                            if not matches:
-                                st.warning("No suitable positions found.")
-                            else:
-                                for match in matches:
-                                    with st.container():
-                                        col1, col2 = st.columns([2, 1])
-                                        with col1:
-                                            st.write(f"**Job ID:** {match['job_id']}")
-                                            st.write(f"**Reasoning:** {match['reasoning']}")
-                                            st.write("**Key Matches:**")
-                                            for skill in match['key_matches']:
-                                                st.write(f"- {skill}")
-                                        with col2:
-                                            st.metric("Match Score", f"{match['match_score']}%")
-                                            if match.get('gaps'):
-                                                st.write("**Skill Gaps:**")
-                                                for gap in match['gaps']:
-                                                    st.write(f"- {gap}")
-                                    st.divider()
-
-                        with tab3:
-                            st.subheader("Screening Results")
-                            screening = eval(result["screening_results"]["screening_report"])
-                            
-                            # Display qualification alignment
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.metric("Qualification Score", 
-                                        f"{screening['qualification_alignment']['score']}%")
-                                st.write(screening['qualification_alignment']['analysis'])
-                            with col2:
-                                st.metric("Experience Score", 
-                                        f"{screening['experience_relevance']['score']}%")
-                                st.write(screening['experience_relevance']['analysis'])
-                            
-                            # Display skill match
-                            st.subheader("Skill Assessment")
-                            st.metric("Skill Match Score", f"{screening['skill_match']['score']}%")
-                            col3, col4 = st.columns(2)
-                            with col3:
-                                st.write("**Strengths:**")
-                                for strength in screening['skill_match']['strengths']:
-                                    st.write(f"- {strength}")
-                            with col4:
-                                st.write("**Areas for Development:**")
-                                for gap in screening['skill_match']['gaps']:
-                                    st.write(f"- {gap}")
-                            
-                            # Display red flags if any
-                            if screening['red_flags']:
-                                st.warning("**Potential Concerns:**")
-                                for flag in screening['red_flags']:
-                                    st.write(f"- {flag}")
-
-                        with tab4:
-                            st.subheader("Final Recommendation")
-                            recommendation = eval(result["final_recommendation"]["final_recommendation"])
-                            
-                            # Display summary
-                            st.write("### Summary")
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.write("**Strengths:**")
-                                for strength in recommendation['summary']['candidate_strengths']:
-                                    st.write(f"- {strength}")
-                            with col2:
-                                st.write("**Development Areas:**")
-                                for area in recommendation['summary']['development_areas']:
-                                    st.write(f"- {area}")
-                            
-                            # Display hiring recommendation
-                            st.write("### Hiring Recommendation")
-                            decision = recommendation['hiring_recommendation']['decision']
-                            if decision in ["Strongly Recommend", "Recommend"]:
-                                st.success(decision)
-                            elif decision == "Consider":
-                                st.warning(decision)
-                            else:
-                                st.error(decision)
-                            st.write(recommendation['hiring_recommendation']['rationale'])
-                            
-                            # Display next steps
-                            st.write("### Next Steps")
-                            for step in recommendation['recommendations']['immediate_next_steps']:
-                                st.write(f"- {step}")
+                        parsed = parse_result(result)
+                        render_result_tabs(parsed)
 
                         # Save results
-                        output_dir = Path("results")
-                        output_dir.mkdir(exist_ok=True)
-                        output_file = (
-                            output_dir
-                            / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-                        )
-
-                        with open(output_file, "w") as f:
-                            f.write(str(result))
+                        segment = save_result(result, parsed, uploaded_file.name)
 
-                        st.success(
-                            f"Analysis completed! Results saved to {output_file}",
-                            icon="✅",
-                        )
+                        if segment is None:
+                            st.info("Same results as an earlier upload of this resume, which were already saved.")
+                        elif result["status"] == "completed":
+                            st.success(
+                                f"Analysis completed! Results saved to {segment}",
+                                icon="✅",
+                            )
+                        else:
+                            st.info(f"Partial results saved to {segment}")
 
                 except Exception as e:
                     st.error(f"Error processing resume: {str(e)}")
                     logger.error(f"Error processing resume: {str(e)}")
 
-                finally:
-                    # Clean up uploaded file
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        logger.error(f"Error removing temporary file: {str(e)}")
-
             except Exception as e:
                 st.error(f"Error handling file upload: {str(e)}")
                 logger.error(f"Error handling file upload: {str(e)}")
 
+    elif selected == "Find Candidates":
+        render_candidate_search()
+
+    elif selected == "Analytics":
+        render_analytics()
+
     elif selected == "About":
         st.header("About AI Recruiter Agency")
         st.write(
@@ -0,0 +1,80 @@
+"""Cold-start benchmark for the recruitment pipeline.
+
+Each sample runs in a fresh interpreter and measures how long it takes to
+import the modules app.py needs and to build the orchestrator, which is what
+a container restart or the first Streamlit session pays.
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE = """
+import json, time
+start = time.perf_counter()
+import agents.orchestrator, db.database, db.result_store, utils.logger
+imported = time.perf_counter()
+from agents.orchestrator import OrchestratorAgent
+OrchestratorAgent()
+first = time.perf_counter()
+OrchestratorAgent()
+second = time.perf_counter()
+heavy = [m for m in ("openai", "pdfminer", "psycopg2", "pandas", "numpy") if m in __import__("sys").modules]
+print(json.dumps({
+    "import_seconds": imported - start,
+    "first_orchestrator_seconds": first - imported,
+    "second_orchestrator_seconds": second - first,
+    "heavy_modules_loaded": heavy,
+}))
+"""
+
+
+def run_sample(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "SQLITE_PATH": os.path.join(tmp, "bench.sqlite"),
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "benchmark"),
+        }
+        env.pop("DATABASE_URL", None)
+        samples = [run_sample(env) for _ in range(args.runs)]
+
+    results = {
+        key: round(statistics.median(s[key] for s in samples), 4)
+        for key in ("import_seconds", "first_orchestrator_seconds", "second_orchestrator_seconds")
+    }
+    results["heavy_modules_loaded"] = samples[-1]["heavy_modules_loaded"]
+    results["runs"] = args.runs
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
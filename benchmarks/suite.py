@@ -0,0 +1,258 @@
+"""Microbenchmarks for the database and extraction hot paths.
+
+Runs offline against a temporary SQLite database, and against Postgres when
+BENCH_DATABASE_URL is set (throwaway schemas are created and dropped there).
+Results are written as JSON; --compare flags regressions against an earlier
+run, e.g. one recorded on the previous commit:
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json --threshold 0.30
+
+Exits with status 1 when a regression is found.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db.database import JobDatabase  # noqa: E402
+
+JOB_COUNTS = (1_000, 10_000, 100_000)
+MATCH_COUNT = 2_000
+ADD_JOB_COUNT = 200
+# Upper bound on samples of one benchmark
+MAX_RUNS = 200
+
+JOB = {
+    "title": "Senior Python Developer",
+    "company": "Benchmark Corp",
+    "location": "Remote",
+    "type": "Full-time",
+    "experience_level": "Senior",
+    "salary_range": "$120k - $150k",
+    "description": "Build and maintain data-heavy backend services. " * 5,
+    "requirements": ["Python", "PostgreSQL", "AWS", "Docker", "5+ years experience"],
+    "benefits": ["Health insurance", "Remote work", "401k"],
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_seconds: float = 1.0) -> Dict[str, float]:
+    """Time `fn`, returning summary statistics in seconds.
+
+    After one untimed warm-up call, `fn` runs at least `repeat` times and
+    until `min_seconds` have been spent, so fast benchmarks get enough
+    samples for a stable median.
+    """
+    fn()
+    samples = []
+    while len(samples) < repeat or (sum(samples) < min_seconds and len(samples) < MAX_RUNS):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median": round(statistics.median(samples), 6),
+        "min": round(min(samples), 6),
+        "mean": round(statistics.mean(samples), 6),
+        "runs": len(samples),
+    }
+
+
+class Backend:
+    """A database to benchmark, isolated from the application's data"""
+
+    def __init__(self, name: str, tmp_dir: str, postgres_url: Optional[str] = None):
+        self.name = name
+        self.tmp_dir = tmp_dir
+        self.postgres_url = postgres_url
+        self.schemas = []
+
+    def url(self, schema: str) -> str:
+        separator = "&" if "?" in self.postgres_url else "?"
+        # public stays on the path for the pgvector extension's types
+        return f"{self.postgres_url}{separator}options=-csearch_path%3D{schema},public"
+
+    def fresh(self) -> JobDatabase:
+        """A JobDatabase on a new, empty database, initialized as the app would"""
+        if self.postgres_url:
+            schema = f"bench_{uuid.uuid4().hex[:8]}"
+            self._run_admin(f"CREATE SCHEMA {schema}")
+            self.schemas.append(schema)
+            os.environ["DATABASE_URL"] = self.url(schema)
+        else:
+            os.environ.pop("DATABASE_URL", None)
+            os.environ["SQLITE_PATH"] = str(Path(self.tmp_dir) / f"{uuid.uuid4().hex}.sqlite")
+        return JobDatabase()
+
+    def cleanup(self):
+        if self.schemas:
+            self._run_admin("; ".join(f"DROP SCHEMA IF EXISTS {s} CASCADE" for s in self.schemas))
+            self.schemas = []
+
+    def _run_admin(self, sql: str):
+        import psycopg2
+
+        conn = psycopg2.connect(self.postgres_url)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def seed_jobs(db: JobDatabase, count: int):
+    """Insert `count` jobs in one transaction"""
+    db.add_jobs([JOB] * count)
+
+
+def bench_database(backend: Backend, repeat: int) -> Dict[str, Any]:
+    results = {}
+
+    def init():
+        backend.fresh()
+
+    results["init_db"] = measure(init, repeat)
+
+    db = backend.fresh()
+    stats = measure(lambda: [db.add_job(JOB) for _ in range(ADD_JOB_COUNT)], repeat)
+    stats["per_op"] = round(stats["median"] / ADD_JOB_COUNT, 6)
+    results[f"add_job_x{ADD_JOB_COUNT}"] = stats
+
+    for count in JOB_COUNTS:
+        db = backend.fresh()
+        seed_jobs(db, count)
+        results[f"get_all_jobs_{count}"] = measure(db.get_all_jobs, repeat)
+
+    db = backend.fresh()
+    seed_jobs(db, 10)
+    matches = [
+        {
+            "job_id": 1 + i % 10,
+            "match_score": i % 100,
+            "reasoning": "Strong overlap in backend skills and seniority.",
+            "key_matches": ["Python", "AWS"],
+            "gaps": ["Kubernetes"],
+        }
+        for i in range(MATCH_COUNT)
+    ]
+    application_id = db.create_application(db.add_candidate({"name": "Bench"}))
+    results[f"save_job_matches_x{MATCH_COUNT}"] = measure(
+        lambda: db.save_job_matches(application_id, matches), repeat
+    )
+    return results
+
+
+def bench_extraction(corpus: List[Path], repeat: int) -> Dict[str, Any]:
+    from pdfminer.high_level import extract_text
+
+    from tools.pdf_text import PDFTextExtractor
+
+    results = {}
+    extractor = PDFTextExtractor(workers=1)
+    for pdf in corpus:
+        data = pdf.read_bytes()
+        results[f"pdfminer_{pdf.stem}"] = measure(lambda: extract_text(pdf), repeat)
+        results[f"extractor_{pdf.stem}"] = measure(lambda: extractor.extract(data), repeat)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Benchmarks whose median slowed down by more than `threshold` (a fraction)"""
+    regressions = []
+    for suite, benchmarks in current["benchmarks"].items():
+        for name, stats in benchmarks.items():
+            before = baseline.get("benchmarks", {}).get(suite, {}).get(name)
+            if not before or not before["median"]:
+                continue
+            change = stats["median"] / before["median"] - 1
+            line = f"{suite}/{name}: {before['median']:.6f}s -> {stats['median']:.6f}s ({change:+.1%})"
+            print(("REGRESSION " if change > threshold else "           ") + line)
+            if change > threshold:
+                regressions.append(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Minimum runs per benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Earlier results JSON to check for regressions")
+    # Even with more samples, medians of back-to-back runs on a small shared
+    # VM differ by up to ~30%; lower it on dedicated benchmark hardware
+    parser.add_argument("--threshold", type=float, default=0.30, help="Allowed slowdown, 0.30 = 30%%")
+    parser.add_argument("--corpus", default=str(ROOT / "resumes"), help="Directory of PDFs")
+    parser.add_argument("--skip-extraction", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    saved_env = {key: os.environ.get(key) for key in ("DATABASE_URL", "SQLITE_PATH")}
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [Backend("sqlite", tmp)]
+        if os.getenv("BENCH_DATABASE_URL"):
+            backends.append(Backend("postgres", tmp, os.getenv("BENCH_DATABASE_URL")))
+
+        try:
+            for backend in backends:
+                print(f"Benchmarking {backend.name}...", file=sys.stderr)
+                try:
+                    results["benchmarks"][backend.name] = bench_database(backend, args.repeat)
+                finally:
+                    backend.cleanup()
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    if not args.skip_extraction:
+        corpus = sorted(Path(args.corpus).glob("*.pdf"))
+        print(f"Benchmarking extraction on {len(corpus)} PDFs...", file=sys.stderr)
+        results["benchmarks"]["extraction"] = bench_extraction(corpus, args.repeat)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nComparing against {baseline.get('commit')} ({args.compare}):")
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
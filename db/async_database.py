@@ -0,0 +1,178 @@
+import asyncio
+import contextvars
+import functools
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from .database import JobDatabase
+
+_async_db = None
+_async_db_lock = threading.Lock()
+
+
+class _PooledJobDatabase(JobDatabase):
+    """JobDatabase that keeps one open connection per thread instead of one per call"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        super().__init__()
+
+    def get_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or (self.is_postgres and conn.closed):
+            if self.is_postgres:
+                conn = super().get_connection()
+            else:
+                # Only ever used by this thread, but closable from any thread
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _release_connection(self, conn):
+        # Ends the read transaction and its cursors, the connection stays open for reuse
+        conn.rollback()
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+def _chunked(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class AsyncJobDatabase:
+    """Non-blocking access to JobDatabase from coroutines.
+
+    Every public JobDatabase method is available as a coroutine with the same
+    signature. Calls run on a dedicated executor whose threads each keep a
+    persistent connection, so database I/O overlaps with other coroutines,
+    such as in-flight LLM calls, instead of stalling the event loop.
+    """
+
+    def __init__(self, pool_size: int = None):
+        self.pool_size = pool_size or int(os.getenv("DB_POOL_SIZE", "4"))
+        self._db = _PooledJobDatabase()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="db"
+        )
+
+    @property
+    def is_postgres(self) -> bool:
+        return self._db.is_postgres
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the database executor"""
+        loop = asyncio.get_running_loop()
+        # Keep the caller's context (e.g. the application id used in logs)
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, fn, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return method
+
+    async def iter_batches(self, *args, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Async version of JobDatabase.iter_batches"""
+        async for batch in self._stream(self._db.iter_batches, *args, **kwargs):
+            yield batch
+
+    async def iter_candidate_profiles(self, *args, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of JobDatabase.iter_candidate_profiles"""
+        # Handed over in chunks, a queue round-trip per row would dominate
+        async for chunk in self._stream(
+            self._db.iter_candidate_profiles, *args, _chunk_size=500, **kwargs
+        ):
+            for profile in chunk:
+                yield profile
+
+    async def _stream(
+        self, fn: Callable, *args, _chunk_size: int = None, **kwargs
+    ) -> AsyncIterator[Any]:
+        """Drive a blocking generator on one executor thread, a few items ahead of the consumer.
+
+        With `_chunk_size`, items are passed on as lists of up to that many.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=2)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            generator = fn(*args, **kwargs)
+            items = _chunked(generator, _chunk_size) if _chunk_size else generator
+            try:
+                for item in items:
+                    if stop.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+                asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+            except BaseException as e:
+                if not stop.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(_Failure(e)), loop).result()
+            finally:
+                # Runs the generator's cleanup on the thread that owns its connection
+                generator.close()
+
+        producer = loop.run_in_executor(
+            self._executor, functools.partial(contextvars.copy_context().run, produce)
+        )
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            # Unblock a producer waiting on the full queue
+            while not producer.done():
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.wait([producer], timeout=0.05)
+
+    async def close(self):
+        """Stop the executor and close its connections"""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._db.close()
+
+
+def get_async_database() -> AsyncJobDatabase:
+    """AsyncJobDatabase shared by all agents in this process"""
+    global _async_db
+    with _async_db_lock:
+        if _async_db is None:
+            _async_db = AsyncJobDatabase()
+        return _async_db
@@ -1,16 +1,25 @@
+import hashlib
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple
 import json
-from datetime import datetime
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from datetime import datetime, timedelta
 import sqlite3
 import logging
+import threading
+from .text_codec import compress_text, decompress_text
+
+# numpy is imported where it's used, keeping it off the app's startup path
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 class JobDatabase:
+    # Databases whose schema has already been applied in this process
+    _initialized = set()
+    _init_lock = threading.Lock()
+
     def __init__(self):
         self.db_url = os.getenv('DATABASE_URL')
         self.is_postgres = bool(self.db_url and self.db_url.startswith('postgres'))
@@ -18,17 +27,27 @@ class JobDatabase:
         if not self.is_postgres:
             # Local SQLite setup
             current_dir = Path(__file__).parent
-            self.db_path = current_dir / "jobs.sqlite"
+            self.db_path = Path(os.getenv("SQLITE_PATH", current_dir / "jobs.sqlite"))
             self.schema_path = current_dir / "schema.sql"
         else:
             self.schema_path = Path(__file__).parent / "schema.sql"
         
-        self._init_db()
+        target = self.db_url if self.is_postgres else str(self.db_path)
+        with self._init_lock:
+            if target not in self._initialized:
+                self._init_db()
+                self.compress_legacy_texts()
+                self.backfill_analytics_rollups()
+                self._initialized.add(target)
 
     def get_connection(self):
         """Get database connection based on environment"""
         try:
             if self.is_postgres:
+                # Imported here so SQLite deployments never load the driver
+                import psycopg2
+                from psycopg2.extras import RealDictCursor
+
                 conn = psycopg2.connect(self.db_url)
                 conn.cursor_factory = RealDictCursor
                 return conn
@@ -63,6 +82,15 @@ class JobDatabase:
             if self.is_postgres:
                 schema = schema.replace('AUTOINCREMENT', 'GENERATED ALWAYS AS IDENTITY')
                 schema = schema.replace('TEXT', 'VARCHAR')
+                schema = schema.replace('BLOB', 'BYTEA')
+            else:
+                # SQLite has no pgvector, skip the statements that need it
+                schema = ";".join(
+                    s for s in schema.split(";")
+                    if "EXTENSION" not in s and "ivfflat" not in s
+                )
+                # Only INTEGER PRIMARY KEY columns get generated ids in SQLite
+                schema = schema.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
 
             with self.get_connection() as conn:
                 if self.is_postgres:
@@ -75,7 +103,8 @@ class JobDatabase:
                                 conn.commit()
                             except Exception as e:
                                 logger.error(f"Error executing statement: {str(e)}\nStatement: {statement}")
-                                # Continue with next statement
+                                # Clear the aborted transaction, then continue with next statement
+                                conn.rollback()
                                 continue
                 else:
                     # SQLite can execute multiple statements
@@ -86,6 +115,50 @@ class JobDatabase:
             logger.error(f"Error initializing database: {str(e)}")
             raise
 
+    def _prepare_query(self, query: str) -> str:
+        """Adapt SQLite-style placeholders to the active driver"""
+        return query.replace("?", "%s") if self.is_postgres else query
+
+    def _fetch_all(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a read query and return rows as dictionaries"""
+        with self.get_connection() as conn:
+            if not self.is_postgres:
+                conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(self._prepare_query(query), params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def iter_batches(
+        self,
+        query: str,
+        params: tuple = (),
+        batch_size: int = 2000,
+        cursor_name: str = "batch_reader",
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream a read query in batches of row dictionaries at constant memory"""
+        conn = self.get_connection()
+        try:
+            if self.is_postgres:
+                # Named cursor: rows stay on the server until fetched
+                cursor = conn.cursor(name=cursor_name)
+                cursor.itersize = batch_size
+            else:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+            cursor.execute(self._prepare_query(query), params)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+        finally:
+            self._release_connection(conn)
+
+    def _release_connection(self, conn):
+        """Done with a connection taken outside a `with` block"""
+        conn.close()
+
     def _serialize_list(self, data: List) -> str:
         """Serialize list data to JSON string"""
         return json.dumps(data) if data else "[]"
@@ -98,41 +171,51 @@ class JobDatabase:
             return []
 
     # Job-related methods
+    INSERT_JOB_QUERY = """
+    INSERT INTO jobs (
+        title, company, location, type, experience_level,
+        salary_range, description, requirements, benefits
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _job_row(self, job_data: Dict[str, Any]) -> tuple:
+        return (
+            job_data["title"],
+            job_data["company"],
+            job_data["location"],
+            job_data["type"],
+            job_data["experience_level"],
+            job_data.get("salary_range"),
+            job_data["description"],
+            self._serialize_list(job_data["requirements"]),
+            self._serialize_list(job_data.get("benefits", [])),
+        )
+
     def add_job(self, job_data: Dict[str, Any]) -> int:
         """Add a new job to the database"""
-        query = """
-        INSERT INTO jobs (
-            title, company, location, type, experience_level,
-            salary_range, description, requirements, benefits
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        query = self.INSERT_JOB_QUERY
+        if self.is_postgres:
+            query += " RETURNING id"
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                query,
-                (
-                    job_data["title"],
-                    job_data["company"],
-                    job_data["location"],
-                    job_data["type"],
-                    job_data["experience_level"],
-                    job_data.get("salary_range"),
-                    job_data["description"],
-                    self._serialize_list(job_data["requirements"]),
-                    self._serialize_list(job_data.get("benefits", [])),
-                ),
+            cursor.execute(self._prepare_query(query), self._job_row(job_data))
+            return cursor.fetchone()["id"] if self.is_postgres else cursor.lastrowid
+
+    def add_jobs(self, jobs: List[Dict[str, Any]]):
+        """Add many jobs in one transaction, e.g. to import a catalog"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                self._prepare_query(self.INSERT_JOB_QUERY), [self._job_row(job) for job in jobs]
             )
-            return cursor.lastrowid
 
     def get_all_jobs(self) -> List[Dict[str, Any]]:
         """Get all jobs from the database"""
         query = "SELECT * FROM jobs"
         
         with self.get_connection() as conn:
-            if self.is_postgres:
-                conn.row_factory = RealDictCursor
-            else:
+            if not self.is_postgres:
                 conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query)
@@ -154,20 +237,64 @@ class JobDatabase:
                 for row in rows
             ]
 
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single job by id"""
+        rows = self._fetch_all("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = rows[0]
+        job["requirements"] = self._deserialize_list(job["requirements"])
+        job["benefits"] = self._deserialize_list(job["benefits"])
+        return job
+
+    def get_jobs_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to `limit` jobs with ids above `after_id`, in id order"""
+        jobs = self._fetch_all(
+            "SELECT * FROM jobs WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        )
+        for job in jobs:
+            job["requirements"] = self._deserialize_list(job["requirements"])
+            job["benefits"] = self._deserialize_list(job["benefits"])
+        return jobs
+
+    # Job columns that matching and screening read
+    JOB_CONTENT_COLUMNS = [
+        "id", "title", "company", "location", "type", "experience_level",
+        "salary_range", "description", "requirements", "benefits",
+    ]
+
+    def get_catalog_version(self) -> str:
+        """Fingerprint of the job catalog that changes whenever jobs are added, edited or removed"""
+        # Hashes the content itself, as nothing maintains updated_at on edits
+        query = f"SELECT {', '.join(self.JOB_CONTENT_COLUMNS)} FROM jobs ORDER BY id"
+        digest = hashlib.sha256()
+        for row in self._fetch_all(query):
+            digest.update(
+                json.dumps([row[column] for column in self.JOB_CONTENT_COLUMNS]).encode("utf-8")
+            )
+        return digest.hexdigest()
+
     # Candidate-related methods
+    # Candidate columns, without the resume text and vector that most reads don't need
+    CANDIDATE_COLUMNS = [
+        "id", "name", "email", "phone", "location", "current_title",
+        "resume_path", "created_at", "updated_at",
+    ]
+
     def add_candidate(self, candidate_data: Dict[str, Any]) -> int:
-        """Add a new candidate to the database"""
+        """Add a new candidate to the database, storing the resume text compressed"""
         query = """
         INSERT INTO candidates (
-            name, email, phone, location, current_title,
-            resume_path, raw_text
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            name, email, phone, location, current_title, resume_path
+        ) VALUES (?, ?, ?, ?, ?, ?)
         """
+        if self.is_postgres:
+            query += " RETURNING id"
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                query,
+                self._prepare_query(query),
                 (
                     candidate_data.get("name"),
                     candidate_data.get("email"),
@@ -175,19 +302,137 @@ class JobDatabase:
                     candidate_data.get("location"),
                     candidate_data.get("current_title"),
                     candidate_data.get("resume_path"),
-                    candidate_data.get("raw_text"),
                 ),
             )
-            return cursor.lastrowid
+            candidate_id = cursor.fetchone()["id"] if self.is_postgres else cursor.lastrowid
+            if candidate_data.get("raw_text"):
+                self._save_candidate_text(cursor, candidate_id, candidate_data["raw_text"])
+            return candidate_id
+
+    def _save_candidate_text(self, cursor, candidate_id: int, raw_text: str):
+        """Store a candidate's resume text compressed in the side table"""
+        codec, compressed = compress_text(raw_text)
+        query = """
+        INSERT INTO candidate_texts (candidate_id, codec, original_size, compressed)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (candidate_id) DO UPDATE SET
+            codec = excluded.codec,
+            original_size = excluded.original_size,
+            compressed = excluded.compressed
+        """
+        cursor.execute(
+            self._prepare_query(query),
+            (candidate_id, codec, len(raw_text.encode("utf-8")), compressed),
+        )
+
+    def get_candidate(
+        self, candidate_id: int, include_raw_text: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Get a candidate; the resume text is only loaded when asked for"""
+        query = f"SELECT {', '.join(self.CANDIDATE_COLUMNS)} FROM candidates WHERE id = ?"
+        rows = self._fetch_all(query, (candidate_id,))
+        if not rows:
+            return None
+        candidate = rows[0]
+        if include_raw_text:
+            candidate["raw_text"] = self.get_candidate_raw_text(candidate_id)
+        return candidate
+
+    def get_candidate_raw_text(self, candidate_id: int) -> Optional[str]:
+        """Decompressed resume text of a candidate"""
+        rows = self._fetch_all(
+            "SELECT codec, compressed FROM candidate_texts WHERE candidate_id = ?",
+            (candidate_id,),
+        )
+        if not rows:
+            return None
+        return decompress_text(rows[0]["codec"], rows[0]["compressed"])
+
+    def get_candidate_texts_after(self, after_id: int, limit: int) -> List[Tuple[int, str]]:
+        """(candidate id, resume text) of up to `limit` candidates with ids above `after_id`"""
+        rows = self._fetch_all(
+            """
+            SELECT candidate_id, codec, compressed FROM candidate_texts
+            WHERE candidate_id > ? ORDER BY candidate_id LIMIT ?
+            """,
+            (after_id, limit),
+        )
+        return [
+            (row["candidate_id"], decompress_text(row["codec"], row["compressed"]))
+            for row in rows
+        ]
+
+    def compress_legacy_texts(self, batch_size: int = 500) -> int:
+        """Move resume text still stored inline in candidates into the compressed side table"""
+        select_query = """
+        SELECT id, raw_text FROM candidates
+        WHERE raw_text IS NOT NULL
+        ORDER BY id
+        LIMIT ?
+        """
+        clear_query = "UPDATE candidates SET raw_text = NULL WHERE id = ?"
+
+        moved = 0
+        while True:
+            rows = self._fetch_all(select_query, (batch_size,))
+            if not rows:
+                break
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                for row in rows:
+                    self._save_candidate_text(cursor, row["id"], row["raw_text"])
+                    cursor.execute(self._prepare_query(clear_query), (row["id"],))
+            moved += len(rows)
+
+        if moved:
+            logger.info(f"Compressed resume text of {moved} candidates")
+        return moved
+
+    def get_candidate_id(self, email: str) -> Optional[int]:
+        """Id of the candidate with this email, if one exists"""
+        rows = self._fetch_all("SELECT id FROM candidates WHERE email = ?", (email,))
+        return rows[0]["id"] if rows else None
+
+    def iter_candidate_profiles(self, batch_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Stream the latest analysis of every candidate without loading them all at once"""
+        query = """
+        SELECT
+            ar.application_id,
+            a.candidate_id,
+            c.name,
+            c.email,
+            c.current_title,
+            ar.technical_skills,
+            ar.experience_level,
+            ar.education_level,
+            ar.domain_expertise
+        FROM analysis_results ar
+        JOIN applications a ON a.id = ar.application_id
+        LEFT JOIN candidates c ON c.id = a.candidate_id
+        WHERE ar.id IN (
+            SELECT MAX(ar2.id)
+            FROM analysis_results ar2
+            JOIN applications a2 ON a2.id = ar2.application_id
+            GROUP BY a2.candidate_id
+        )
+        """
+
+        for rows in self.iter_batches(query, batch_size=batch_size, cursor_name="candidate_profiles"):
+            for profile in rows:
+                profile["technical_skills"] = self._deserialize_list(profile["technical_skills"])
+                profile["domain_expertise"] = self._deserialize_list(profile["domain_expertise"])
+                yield profile
 
     def create_application(self, candidate_id: int) -> int:
         """Create a new application for a candidate"""
         query = "INSERT INTO applications (candidate_id) VALUES (?)"
-        
+        if self.is_postgres:
+            query += " RETURNING id"
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, (candidate_id,))
-            return cursor.lastrowid
+            cursor.execute(self._prepare_query(query), (candidate_id,))
+            return cursor.fetchone()["id"] if self.is_postgres else cursor.lastrowid
 
     def save_analysis_results(self, application_id: int, analysis_data: Dict[str, Any]):
         """Save analysis results for an application"""
@@ -201,7 +446,7 @@ class JobDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                query,
+                self._prepare_query(query),
                 (
                     application_id,
                     self._serialize_list(analysis_data.get("technical_skills", [])),
@@ -225,7 +470,7 @@ class JobDatabase:
             cursor = conn.cursor()
             for match in matches_data:
                 cursor.execute(
-                    query,
+                    self._prepare_query(query),
                     (
                         application_id,
                         match["job_id"],
@@ -249,7 +494,7 @@ class JobDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                query,
+                self._prepare_query(query),
                 (
                     application_id,
                     screening_data["qualification_alignment"]["score"],
@@ -264,6 +509,44 @@ class JobDatabase:
                 ),
             )
 
+    def save_job_screening_reports(self, application_id: int, reports: List[Dict[str, Any]]):
+        """Save the per-job screening reports of an application"""
+        query = """
+        INSERT INTO job_screening_reports (application_id, job_id, match_score, report)
+        VALUES (?, ?, ?, ?)
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                self._prepare_query(query),
+                [
+                    (
+                        application_id,
+                        report["job_id"],
+                        report.get("match_score"),
+                        json.dumps(report["screening_report"]),
+                    )
+                    for report in reports
+                ],
+            )
+
+    def get_job_screening_reports(self, application_id: int) -> List[Dict[str, Any]]:
+        """Per-job screening reports of an application, best match first"""
+        rows = self._fetch_all(
+            """
+            SELECT jsr.job_id, j.title AS job_title, j.company, jsr.match_score, jsr.report
+            FROM job_screening_reports jsr
+            LEFT JOIN jobs j ON j.id = jsr.job_id
+            WHERE jsr.application_id = ?
+            ORDER BY jsr.match_score DESC
+            """,
+            (application_id,),
+        )
+        for row in rows:
+            row["screening_report"] = json.loads(row.pop("report"))
+        return rows
+
     def save_recommendation(self, application_id: int, recommendation_data: Dict[str, Any]):
         """Save recommendation for an application"""
         query = """
@@ -278,7 +561,7 @@ class JobDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                query,
+                self._prepare_query(query),
                 (
                     application_id,
                     self._serialize_list(recommendation_data["summary"]["candidate_strengths"]),
@@ -294,6 +577,31 @@ class JobDatabase:
                 ),
             )
 
+    def save_application_result(
+        self,
+        candidate_data: Dict[str, Any],
+        analysis: Dict[str, Any],
+        matches: List[Dict[str, Any]],
+        screening: Dict[str, Any],
+        recommendation: Dict[str, Any],
+        per_job_screening: Optional[List[Dict[str, Any]]] = None,
+    ) -> int:
+        """Persist a completed application, reusing the candidate record when the email is known"""
+        email = candidate_data.get("email")
+        candidate_id = self.get_candidate_id(email) if email else None
+        if candidate_id is None:
+            candidate_id = self.add_candidate(candidate_data)
+
+        application_id = self.create_application(candidate_id)
+        self.save_analysis_results(application_id, analysis)
+        self.save_job_matches(application_id, matches)
+        self.save_screening_report(application_id, screening)
+        if per_job_screening:
+            self.save_job_screening_reports(application_id, per_job_screening)
+        self.save_recommendation(application_id, recommendation)
+        self._add_to_analytics_rollups(application_id)
+        return application_id
+
     def get_application_history(self, candidate_id: int) -> List[Dict[str, Any]]:
         """Get complete application history for a candidate"""
         query = """
@@ -313,12 +621,316 @@ class JobDatabase:
         """
 
         with self.get_connection() as conn:
-            if self.is_postgres:
-                conn.row_factory = RealDictCursor
-            else:
+            if not self.is_postgres:
                 conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            cursor.execute(query, (candidate_id,))
+            cursor.execute(self._prepare_query(query), (candidate_id,))
             rows = cursor.fetchall()
 
             return [dict(row) for row in rows]
+
+    # Analytics rollups
+    # Width of the stored score buckets; coarser buckets are summed from them
+    ROLLUP_BUCKET_SIZE = 10
+    ROLLUP_TABLES = [
+        "analytics_score_buckets",
+        "analytics_decisions",
+        "analytics_skill_gaps",
+        "analytics_daily_applications",
+    ]
+    SCORE_COLUMNS = [
+        ("job_matches", "match", "match_score"),
+        ("screening_reports", "qualification", "qualification_score"),
+        ("screening_reports", "experience", "experience_score"),
+        ("screening_reports", "skill_match", "skill_match_score"),
+    ]
+
+    def _rollup_statements(self, op: str, application_id: int) -> List[Tuple[str, tuple]]:
+        """Upserts adding the applications whose id is `op` `application_id` to the rollups"""
+        size = self.ROLLUP_BUCKET_SIZE
+        statements = [
+            (
+                f"""
+                INSERT INTO analytics_score_buckets (score_type, bucket, total)
+                SELECT '{score_type}', CAST({column} AS INTEGER) / {size} * {size}, COUNT(*)
+                FROM {table}
+                WHERE {column} IS NOT NULL AND application_id {op} ?
+                GROUP BY 2
+                ON CONFLICT (score_type, bucket)
+                DO UPDATE SET total = analytics_score_buckets.total + excluded.total
+                """,
+                (application_id,),
+            )
+            for table, score_type, column in self.SCORE_COLUMNS
+        ]
+
+        if self.is_postgres:
+            gaps = "job_matches m, json_array_elements_text(m.skill_gaps::json) AS g(value)"
+        else:
+            gaps = "job_matches m, json_each(m.skill_gaps) AS g"
+        statements += [
+            (
+                f"""
+                INSERT INTO analytics_decisions (decision, total)
+                SELECT COALESCE(hiring_decision, 'Unknown'), COUNT(*)
+                FROM recommendations
+                WHERE application_id {op} ?
+                GROUP BY 1
+                ON CONFLICT (decision)
+                DO UPDATE SET total = analytics_decisions.total + excluded.total
+                """,
+                (application_id,),
+            ),
+            (
+                # The pattern is bound, as a literal % would be read as a placeholder by psycopg2
+                f"""
+                INSERT INTO analytics_skill_gaps (skill, total)
+                SELECT LOWER(TRIM(g.value)), COUNT(*)
+                FROM {gaps}
+                WHERE m.skill_gaps LIKE ? AND m.application_id {op} ?
+                GROUP BY 1
+                ON CONFLICT (skill)
+                DO UPDATE SET total = analytics_skill_gaps.total + excluded.total
+                """,
+                ("[%", application_id),
+            ),
+            (
+                f"""
+                INSERT INTO analytics_daily_applications (day, total)
+                SELECT CAST(DATE(submission_date) AS VARCHAR(10)), COUNT(*)
+                FROM applications
+                WHERE submission_date IS NOT NULL AND id {op} ?
+                GROUP BY 1
+                ON CONFLICT (day)
+                DO UPDATE SET total = analytics_daily_applications.total + excluded.total
+                """,
+                (application_id,),
+            ),
+        ]
+        return statements
+
+    def _add_to_analytics_rollups(self, application_id: int):
+        """Count a newly saved application in the rollups, in one transaction"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for query, params in self._rollup_statements("=", application_id):
+                cursor.execute(self._prepare_query(query), params)
+
+    def rebuild_analytics_rollups(self):
+        """Recompute the rollups from the full application tables"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for table in self.ROLLUP_TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+            for query, params in self._rollup_statements(">", 0):
+                cursor.execute(self._prepare_query(query), params)
+
+    def backfill_analytics_rollups(self) -> bool:
+        """Build the rollups of a database that has applications saved before they existed"""
+        if self._fetch_all("SELECT 1 AS found FROM analytics_daily_applications LIMIT 1"):
+            return False
+        if not self._fetch_all("SELECT 1 AS found FROM applications LIMIT 1"):
+            return False
+        logger.info("Building analytics rollups from existing applications")
+        self.rebuild_analytics_rollups()
+        return True
+
+    def get_score_distribution(self, bucket_size: int = 10) -> List[Dict[str, Any]]:
+        """Count match and screening scores per score bucket"""
+        if bucket_size % self.ROLLUP_BUCKET_SIZE:
+            raise ValueError(
+                f"bucket_size must be a multiple of {self.ROLLUP_BUCKET_SIZE}, got {bucket_size}"
+            )
+        query = f"""
+        SELECT score_type, bucket / {bucket_size} * {bucket_size} AS bucket, SUM(total) AS total
+        FROM analytics_score_buckets
+        GROUP BY 1, 2
+        """
+        return self._fetch_all(query)
+
+    def get_decision_mix(self) -> List[Dict[str, Any]]:
+        """Count recommendations per hiring decision"""
+        return self._fetch_all(
+            "SELECT decision, total FROM analytics_decisions ORDER BY total DESC"
+        )
+
+    def get_top_skill_gaps(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most frequent skill gaps across all job matches"""
+        return self._fetch_all(
+            "SELECT skill, total FROM analytics_skill_gaps ORDER BY total DESC LIMIT ?",
+            (limit,),
+        )
+
+    def get_daily_throughput(self, days: int = 90) -> List[Dict[str, Any]]:
+        """Applications submitted per day over the last `days` days"""
+        since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        return self._fetch_all(
+            """
+            SELECT day, total FROM analytics_daily_applications
+            WHERE day >= ?
+            ORDER BY day
+            """,
+            (since,),
+        )
+
+    # Embedding cache methods
+    def get_embeddings(self, text_hashes: List[str]) -> Dict[str, "np.ndarray"]:
+        """Cached embedding vectors by text hash"""
+        import numpy as np
+
+        column = "embedding::text" if self.is_postgres else "embedding_blob"
+        vectors = {}
+        # Bounded IN lists, SQLite caps the number of parameters
+        for start in range(0, len(text_hashes), 500):
+            batch = text_hashes[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            query = f"""
+            SELECT text_hash, {column} AS embedding FROM embeddings
+            WHERE text_hash IN ({placeholders})
+            """
+            for row in self._fetch_all(query, tuple(batch)):
+                if self.is_postgres:
+                    vector = np.array(json.loads(row["embedding"]), dtype=np.float32)
+                else:
+                    vector = np.frombuffer(row["embedding"], dtype=np.float32)
+                vectors[row["text_hash"]] = vector
+        return vectors
+
+    def save_embeddings(self, rows: List[Tuple[str, str, "np.ndarray"]]):
+        """Store (text_hash, model, vector) rows, keeping any already cached"""
+        if self.is_postgres:
+            query = """
+            INSERT INTO embeddings (text_hash, model, dimensions, embedding)
+            VALUES (?, ?, ?, ?::vector)
+            ON CONFLICT (text_hash) DO NOTHING
+            """
+            params = [
+                (h, model, len(v), "[" + ",".join(f"{x:.7g}" for x in v) + "]")
+                for h, model, v in rows
+            ]
+        else:
+            query = """
+            INSERT INTO embeddings (text_hash, model, dimensions, embedding_blob)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (text_hash) DO NOTHING
+            """
+            params = [(h, model, len(v), v.astype("float32").tobytes()) for h, model, v in rows]
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._prepare_query(query), params)
+
+    def get_entity_embedding_hashes(self, entity_type: str) -> Dict[int, str]:
+        """Text hash of the current embedding of every job or candidate"""
+        rows = self._fetch_all(
+            "SELECT entity_id, text_hash FROM entity_embeddings WHERE entity_type = ?",
+            (entity_type,),
+        )
+        return {row["entity_id"]: row["text_hash"] for row in rows}
+
+    def link_embeddings(self, entity_type: str, links: List[Tuple[int, str]]):
+        """Point jobs or candidates at their embeddings"""
+        query = """
+        INSERT INTO entity_embeddings (entity_type, entity_id, text_hash)
+        VALUES (?, ?, ?)
+        ON CONFLICT (entity_type, entity_id) DO UPDATE SET
+            text_hash = excluded.text_hash,
+            updated_at = CURRENT_TIMESTAMP
+        """
+        # Also fill the indexed pgvector column candidates already have
+        vector_query = """
+        UPDATE candidates SET resume_vector = e.embedding
+        FROM embeddings e
+        WHERE e.text_hash = ? AND candidates.id = ? AND e.dimensions = 1536
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                self._prepare_query(query),
+                [(entity_type, entity_id, text_hash) for entity_id, text_hash in links],
+            )
+            if self.is_postgres and entity_type == "candidates":
+                cursor.executemany(
+                    self._prepare_query(vector_query),
+                    [(text_hash, entity_id) for entity_id, text_hash in links],
+                )
+
+    # Chunked matching cache
+    def get_chunk_matches(
+        self, candidate_hash: str, chunk_hashes: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Cached matches of a candidate profile against job chunks, keyed by chunk hash"""
+        if not chunk_hashes:
+            return {}
+        placeholders = ", ".join("?" for _ in chunk_hashes)
+        query = f"""
+        SELECT chunk_hash, matches FROM match_chunk_cache
+        WHERE candidate_hash = ? AND chunk_hash IN ({placeholders})
+        """
+        rows = self._fetch_all(query, (candidate_hash, *chunk_hashes))
+        return {row["chunk_hash"]: json.loads(row["matches"]) for row in rows}
+
+    def save_chunk_matches(
+        self, candidate_hash: str, chunk_hash: str, matches: List[Dict[str, Any]]
+    ):
+        """Cache the matches of a candidate profile against one job chunk"""
+        query = """
+        INSERT INTO match_chunk_cache (candidate_hash, chunk_hash, matches)
+        VALUES (?, ?, ?)
+        ON CONFLICT (candidate_hash, chunk_hash) DO UPDATE SET matches = excluded.matches
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                self._prepare_query(query), (candidate_hash, chunk_hash, json.dumps(matches))
+            )
+
+    # Near-duplicate index methods
+    def add_resume_signature(
+        self,
+        signature_id: str,
+        signature: str,
+        band_keys: List[str],
+        result: str,
+        catalog_version: str,
+    ):
+        """Store a resume signature and its LSH buckets, replacing any earlier result"""
+        signature_query = """
+        INSERT INTO resume_signatures (signature_id, signature, result, catalog_version)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (signature_id) DO UPDATE SET
+            result = excluded.result,
+            catalog_version = excluded.catalog_version,
+            updated_at = CURRENT_TIMESTAMP
+        """
+        band_query = """
+        INSERT INTO resume_signature_bands (band_key, signature_id)
+        VALUES (?, ?)
+        ON CONFLICT DO NOTHING
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                self._prepare_query(signature_query),
+                (signature_id, signature, result, catalog_version),
+            )
+            cursor.executemany(
+                self._prepare_query(band_query),
+                [(band_key, signature_id) for band_key in band_keys],
+            )
+
+    def find_resume_signatures(self, band_keys: List[str]) -> List[Dict[str, Any]]:
+        """Signatures sharing at least one LSH bucket with the given keys"""
+        placeholders = ", ".join("?" for _ in band_keys)
+        query = f"""
+        SELECT s.signature_id, s.signature, s.result, s.catalog_version
+        FROM resume_signatures s
+        WHERE s.signature_id IN (
+            SELECT DISTINCT b.signature_id
+            FROM resume_signature_bands b
+            WHERE b.band_key IN ({placeholders})
+        )
+        """
+        return self._fetch_all(query, tuple(band_keys))
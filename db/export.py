@@ -0,0 +1,286 @@
+"""Streaming exports of screening, match and recommendation data.
+
+Rows are read in batches through a server-side cursor (Postgres) or
+fetchmany (SQLite), decoded a batch at a time and appended to the output
+file, so memory use stays flat whatever the table size.
+
+    python -m db.export screening_reports --format parquet --output screening.parquet
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from .database import JobDatabase
+
+# pandas and pyarrow are imported where they're used, keeping them off the app's startup path
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_CANDIDATE_COLUMNS = """
+    a.candidate_id,
+    c.name AS candidate_name,
+    c.email AS candidate_email,
+    a.submission_date
+"""
+
+_CANDIDATE_JOINS = """
+    JOIN applications a ON a.id = t.application_id
+    LEFT JOIN candidates c ON c.id = a.candidate_id
+"""
+
+# Per export: the query, and the type of every output column
+EXPORTS: Dict[str, Dict[str, Any]] = {
+    "screening_reports": {
+        "query": f"""
+        SELECT
+            t.id AS report_id,
+            t.application_id,
+            {_CANDIDATE_COLUMNS},
+            t.qualification_score,
+            t.qualification_analysis,
+            t.experience_score,
+            t.experience_analysis,
+            t.skill_match_score,
+            t.strengths,
+            t.gaps,
+            t.cultural_fit_indicators,
+            t.red_flags,
+            t.screening_date
+        FROM screening_reports t
+        {_CANDIDATE_JOINS}
+        ORDER BY t.id
+        """,
+        "columns": {
+            "report_id": "int",
+            "application_id": "int",
+            "candidate_id": "int",
+            "candidate_name": "string",
+            "candidate_email": "string",
+            "submission_date": "timestamp",
+            "qualification_score": "float",
+            "qualification_analysis": "string",
+            "experience_score": "float",
+            "experience_analysis": "string",
+            "skill_match_score": "float",
+            "strengths": "list",
+            "gaps": "list",
+            "cultural_fit_indicators": "list",
+            "red_flags": "list",
+            "screening_date": "timestamp",
+        },
+    },
+    "job_matches": {
+        "query": f"""
+        SELECT
+            t.id AS match_id,
+            t.application_id,
+            {_CANDIDATE_COLUMNS},
+            t.job_id,
+            j.title AS job_title,
+            j.company AS job_company,
+            t.match_score,
+            t.reasoning,
+            t.key_matches,
+            t.skill_gaps,
+            t.match_date
+        FROM job_matches t
+        {_CANDIDATE_JOINS}
+        LEFT JOIN jobs j ON j.id = t.job_id
+        ORDER BY t.id
+        """,
+        "columns": {
+            "match_id": "int",
+            "application_id": "int",
+            "candidate_id": "int",
+            "candidate_name": "string",
+            "candidate_email": "string",
+            "submission_date": "timestamp",
+            "job_id": "int",
+            "job_title": "string",
+            "job_company": "string",
+            "match_score": "float",
+            "reasoning": "string",
+            "key_matches": "list",
+            "skill_gaps": "list",
+            "match_date": "timestamp",
+        },
+    },
+    "recommendations": {
+        "query": f"""
+        SELECT
+            t.id AS recommendation_id,
+            t.application_id,
+            {_CANDIDATE_COLUMNS},
+            t.hiring_decision,
+            t.decision_rationale,
+            t.compensation_range,
+            t.growth_path,
+            t.candidate_strengths,
+            t.development_areas,
+            t.best_fit_roles,
+            t.immediate_next_steps,
+            t.long_term_development,
+            t.suggested_resources,
+            t.recommendation_date
+        FROM recommendations t
+        {_CANDIDATE_JOINS}
+        ORDER BY t.id
+        """,
+        "columns": {
+            "recommendation_id": "int",
+            "application_id": "int",
+            "candidate_id": "int",
+            "candidate_name": "string",
+            "candidate_email": "string",
+            "submission_date": "timestamp",
+            "hiring_decision": "string",
+            "decision_rationale": "string",
+            "compensation_range": "string",
+            "growth_path": "string",
+            "candidate_strengths": "list",
+            "development_areas": "list",
+            "best_fit_roles": "list",
+            "immediate_next_steps": "list",
+            "long_term_development": "list",
+            "suggested_resources": "list",
+            "recommendation_date": "timestamp",
+        },
+    },
+}
+
+FORMATS = ("csv", "parquet")
+
+
+def _decode_lists(values: List[Optional[str]]) -> List[List[str]]:
+    """Decode a batch of JSON list columns with a single parser call"""
+    encoded = [v if v and v.startswith("[") else "[]" for v in values]
+    try:
+        decoded = json.loads("[" + ",".join(encoded) + "]")
+    except json.JSONDecodeError:
+        # A malformed value somewhere in the batch, fall back to one at a time
+        decoded = []
+        for value in encoded:
+            try:
+                decoded.append(json.loads(value))
+            except json.JSONDecodeError:
+                decoded.append([])
+    return [[str(item) for item in items] for items in decoded]
+
+
+class ResultExporter:
+    """Stream one of the EXPORTS to CSV or Parquet"""
+
+    def __init__(self, db: Optional[JobDatabase] = None, batch_size: int = 5000):
+        self.db = db or JobDatabase()
+        self.batch_size = batch_size
+
+    def _arrow_schema(self, columns: Dict[str, str]):
+        import pyarrow as pa
+
+        types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "string": pa.string(),
+            "timestamp": pa.timestamp("us"),
+            "list": pa.list_(pa.string()),
+        }
+        return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+    def iter_frames(self, export: str) -> Iterator["pd.DataFrame"]:
+        """Decoded batches of an export as DataFrames with stable column types"""
+        import pandas as pd
+
+        if export not in EXPORTS:
+            raise ValueError(f"Unknown export '{export}', expected one of {list(EXPORTS)}")
+        spec = EXPORTS[export]
+
+        for rows in self.db.iter_batches(
+            spec["query"], batch_size=self.batch_size, cursor_name=f"export_{export}"
+        ):
+            frame = pd.DataFrame.from_records(rows, columns=list(spec["columns"]))
+            for name, kind in spec["columns"].items():
+                if kind == "list":
+                    frame[name] = _decode_lists(frame[name].tolist())
+                elif kind == "timestamp":
+                    frame[name] = pd.to_datetime(frame[name], errors="coerce")
+                elif kind in ("int", "float"):
+                    frame[name] = pd.to_numeric(frame[name], errors="coerce")
+                    if kind == "int":
+                        frame[name] = frame[name].astype("Int64")
+            yield frame
+
+    def export(self, export: str, output: str, fmt: Optional[str] = None) -> int:
+        """Write an export to `output`, returning the number of rows written"""
+        if export not in EXPORTS:
+            raise ValueError(f"Unknown export '{export}', expected one of {list(EXPORTS)}")
+        output = Path(output)
+        fmt = fmt or output.suffix.lstrip(".")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_output = output.with_name(output.name + ".tmp")
+        columns = EXPORTS[export]["columns"]
+        list_columns = [name for name, kind in columns.items() if kind == "list"]
+
+        rows = 0
+        writer = None
+        try:
+            if fmt == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                schema = self._arrow_schema(columns)
+                writer = pq.ParquetWriter(tmp_output, schema)
+            else:
+                open(tmp_output, "w").close()
+
+            for frame in self.iter_frames(export):
+                if fmt == "parquet":
+                    writer.write_table(
+                        pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+                    )
+                else:
+                    for name in list_columns:
+                        frame[name] = ["; ".join(items) for items in frame[name]]
+                    frame.to_csv(tmp_output, mode="a", header=rows == 0, index=False)
+                rows += len(frame)
+
+            if fmt == "parquet":
+                writer.close()
+                writer = None
+            elif rows == 0:
+                # Header only, so empty exports are still valid CSV
+                import pandas as pd
+
+                pd.DataFrame(columns=list(columns)).to_csv(tmp_output, index=False)
+            tmp_output.replace(output)
+        finally:
+            if writer is not None:
+                writer.close()
+            if tmp_output.exists():
+                tmp_output.unlink()
+
+        logger.info(f"Exported {rows} {export} rows to {output}")
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("export", choices=list(EXPORTS))
+    parser.add_argument("--output", required=True, help="Output file (.csv or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the output file's extension")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    rows = ResultExporter(batch_size=args.batch_size).export(args.export, args.output, args.format)
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,11 +29,17 @@ def migrate_to_postgres():
         tables = [
             'jobs',
             'candidates',
+            'candidate_texts',
             'applications',
             'analysis_results',
             'job_matches',
             'screening_reports',
-            'recommendations'
+            'job_screening_reports',
+            'recommendations',
+            'analytics_score_buckets',
+            'analytics_decisions',
+            'analytics_skill_gaps',
+            'analytics_daily_applications'
         ]
 
         for table in tables:
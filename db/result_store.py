@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+# pandas is imported where it's used, keeping it off the app's startup path
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """Append-only store for completed application results.
+
+    New records are appended to JSONL segments. Once enough segments have
+    been sealed they are compacted into a single Parquet file, which is what
+    queries read for everything but the most recent records.
+    """
+
+    COLUMNS = [
+        "timestamp",
+        "file_name",
+        "status",
+        "experience_level",
+        "education_level",
+        "technical_skills",
+        "top_job_id",
+        "top_match_score",
+        "qualification_score",
+        "experience_score",
+        "skill_match_score",
+        "decision",
+        "payload",
+    ]
+    SCORE_COLUMNS = [
+        "top_match_score",
+        "qualification_score",
+        "experience_score",
+        "skill_match_score",
+    ]
+
+    def __init__(
+        self,
+        base_dir: str = "results",
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        compact_after_segments: int = 8,
+    ):
+        self.base_dir = Path(base_dir)
+        self.segment_dir = self.base_dir / "segments"
+        self.parquet_dir = self.base_dir / "parquet"
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_after_segments = compact_after_segments
+        self._lock = threading.Lock()
+
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.parquet_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_record(
+        result: Dict[str, Any],
+        analysis: Optional[Dict[str, Any]] = None,
+        matches: Optional[List[Dict[str, Any]]] = None,
+        screening: Optional[Dict[str, Any]] = None,
+        recommendation: Optional[Dict[str, Any]] = None,
+        file_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Flatten a workflow result and its parsed stages into a store record"""
+        analysis = analysis or {}
+        screening = screening or {}
+        recommendation = recommendation or {}
+        top_match = max(matches or [], key=lambda m: m.get("match_score") or 0, default={})
+
+        # Keep the full result for reference, minus the bulky resume text
+        payload = dict(result)
+        if isinstance(payload.get("extracted_data"), dict):
+            payload["extracted_data"] = {
+                k: v for k, v in payload["extracted_data"].items() if k != "raw_text"
+            }
+
+        return {
+            "timestamp": result.get("resume_data", {}).get("submission_timestamp")
+            or datetime.now().isoformat(),
+            "file_name": file_name,
+            "status": result.get("status"),
+            "experience_level": analysis.get("experience_level"),
+            "education_level": analysis.get("education_level"),
+            "technical_skills": analysis.get("technical_skills", []),
+            "top_job_id": str(top_match["job_id"]) if top_match.get("job_id") is not None else None,
+            "top_match_score": top_match.get("match_score"),
+            "qualification_score": screening.get("qualification_alignment", {}).get("score"),
+            "experience_score": screening.get("experience_relevance", {}).get("score"),
+            "skill_match_score": screening.get("skill_match", {}).get("score"),
+            "decision": recommendation.get("hiring_recommendation", {}).get("decision"),
+            "payload": json.dumps(payload, default=str),
+        }
+
+    def _sealed_segments(self) -> List[Path]:
+        """Segments that are no longer being appended to"""
+        segments = sorted(self.segment_dir.glob("segment_*.jsonl"))
+        return segments[:-1]
+
+    def _active_segment(self) -> Path:
+        """Current segment, rolling over to a new one when it is full"""
+        segments = sorted(self.segment_dir.glob("segment_*.jsonl"))
+        if segments and segments[-1].stat().st_size < self.segment_max_bytes:
+            return segments[-1]
+        return self.segment_dir / f"segment_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl"
+
+    def append(self, record: Dict[str, Any]) -> Path:
+        """Append a record and compact sealed segments when enough accumulate"""
+        line = json.dumps({col: record.get(col) for col in self.COLUMNS}, default=str)
+
+        with self._lock:
+            segment = self._active_segment()
+            with open(segment, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+            if len(self._sealed_segments()) >= self.compact_after_segments:
+                try:
+                    self._compact_locked()
+                except Exception as e:
+                    # Segments stay readable, compaction retries on the next append
+                    logger.error(f"Error compacting result segments: {str(e)}")
+
+        return segment
+
+    def compact(self) -> Optional[Path]:
+        """Merge all sealed segments into a new Parquet file"""
+        with self._lock:
+            return self._compact_locked()
+
+    def _compact_locked(self) -> Optional[Path]:
+        import pandas as pd
+
+        segments = self._sealed_segments()
+        if not segments:
+            return None
+
+        frame = pd.concat(
+            [self._read_segment(segment) for segment in segments], ignore_index=True
+        )
+        output = self.parquet_dir / f"part_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+        tmp_output = output.with_suffix(".parquet.tmp")
+        frame.to_parquet(tmp_output, engine="pyarrow", index=False)
+        tmp_output.rename(output)
+
+        for segment in segments:
+            segment.unlink()
+
+        logger.info(f"Compacted {len(segments)} result segments into {output}")
+        return output
+
+    def _normalize(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        """Give segment data the same column types as the Parquet files"""
+        import pandas as pd
+
+        for col in self.COLUMNS:
+            if col not in frame:
+                frame[col] = None
+        frame = frame[self.COLUMNS]
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], format="ISO8601")
+        for col in self.SCORE_COLUMNS:
+            frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+        return frame
+
+    def _read_segment(self, segment: Path) -> "pd.DataFrame":
+        import pandas as pd
+
+        records = []
+        with open(segment, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn write at the tail of a crashed segment
+                    logger.error(f"Skipping malformed line in {segment}")
+        return self._normalize(pd.DataFrame(records, columns=self.COLUMNS))
+
+    def query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        decision: Optional[str] = None,
+        min_score: Optional[float] = None,
+        score_column: str = "top_match_score",
+        columns: Optional[List[str]] = None,
+    ) -> "pd.DataFrame":
+        """Query stored results, reading only the requested columns"""
+        import pandas as pd
+
+        columns = columns or [col for col in self.COLUMNS if col != "payload"]
+        filter_columns = ["timestamp"]
+        if decision is not None:
+            filter_columns.append("decision")
+        if min_score is not None:
+            filter_columns.append(score_column)
+        read_columns = list(dict.fromkeys(columns + filter_columns))
+
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("timestamp", "<", pd.Timestamp(end)))
+        if decision is not None:
+            filters.append(("decision", "==", decision))
+        if min_score is not None:
+            filters.append((score_column, ">=", float(min_score)))
+
+        frames = [
+            pd.read_parquet(
+                part, engine="pyarrow", columns=read_columns, filters=filters or None
+            )
+            for part in sorted(self.parquet_dir.glob("part_*.parquet"))
+        ]
+
+        # Recent records that have not been compacted yet
+        for segment in sorted(self.segment_dir.glob("segment_*.jsonl")):
+            frame = self._read_segment(segment)[read_columns]
+            if start is not None:
+                frame = frame[frame["timestamp"] >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame["timestamp"] < pd.Timestamp(end)]
+            if decision is not None:
+                frame = frame[frame["decision"] == decision]
+            if min_score is not None:
+                frame = frame[frame[score_column] >= float(min_score)]
+            frames.append(frame)
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
@@ -26,7 +26,7 @@ CREATE TABLE IF NOT EXISTS candidates (
     location VARCHAR(255),
     current_title VARCHAR(255),
     resume_path TEXT,
-    raw_text TEXT,
+    raw_text TEXT, -- legacy, resume text now lives compressed in candidate_texts
     resume_vector vector(1536),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -86,6 +86,18 @@ CREATE TABLE IF NOT EXISTS screening_reports (
     FOREIGN KEY (application_id) REFERENCES applications(id)
 );
 
+-- Screening of an application against each of its top matched jobs
+CREATE TABLE IF NOT EXISTS job_screening_reports (
+    id SERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    match_score INTEGER,
+    report TEXT NOT NULL,
+    screening_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (application_id) REFERENCES applications(id),
+    FOREIGN KEY (job_id) REFERENCES jobs(id)
+);
+
 -- Recommendations table
 CREATE TABLE IF NOT EXISTS recommendations (
     id SERIAL PRIMARY KEY,
@@ -102,4 +114,93 @@ CREATE TABLE IF NOT EXISTS recommendations (
     growth_path TEXT,
     recommendation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (application_id) REFERENCES applications(id)
-);
\ No newline at end of file
+);
+
+-- Analytics rollups, updated as each application is saved
+CREATE TABLE IF NOT EXISTS analytics_score_buckets (
+    score_type VARCHAR(20) NOT NULL,
+    bucket INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (score_type, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_decisions (
+    decision VARCHAR(100) PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_skill_gaps (
+    skill TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_daily_applications (
+    day VARCHAR(10) PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+-- Indexes backing the per-application rollup updates
+CREATE INDEX IF NOT EXISTS job_matches_application_idx ON job_matches (application_id);
+CREATE INDEX IF NOT EXISTS screening_reports_application_idx ON screening_reports (application_id);
+CREATE INDEX IF NOT EXISTS job_screening_reports_application_idx ON job_screening_reports (application_id);
+CREATE INDEX IF NOT EXISTS recommendations_application_idx ON recommendations (application_id);
+
+-- Indexes backing reverse matching over stored candidate analyses
+CREATE INDEX IF NOT EXISTS applications_candidate_idx ON applications (candidate_id);
+CREATE INDEX IF NOT EXISTS analysis_results_application_idx ON analysis_results (application_id);
+
+-- Resume text of candidates, compressed and kept out of the candidates rows
+CREATE TABLE IF NOT EXISTS candidate_texts (
+    candidate_id INTEGER PRIMARY KEY REFERENCES candidates(id),
+    codec VARCHAR(16) NOT NULL,
+    original_size INTEGER NOT NULL,
+    compressed BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Embedding vectors, keyed by a hash of the model and the embedded text.
+-- Postgres stores them in the pgvector column, SQLite as float32 blobs
+CREATE TABLE IF NOT EXISTS embeddings (
+    text_hash VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    dimensions INTEGER NOT NULL,
+    embedding vector,
+    embedding_blob BLOB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The embedding each job and candidate currently points at
+CREATE TABLE IF NOT EXISTS entity_embeddings (
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    text_hash VARCHAR(64) NOT NULL REFERENCES embeddings(text_hash),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+-- Job matches of a candidate profile per chunk of the job catalog
+CREATE TABLE IF NOT EXISTS match_chunk_cache (
+    candidate_hash VARCHAR(64) NOT NULL,
+    chunk_hash VARCHAR(64) NOT NULL,
+    matches TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (candidate_hash, chunk_hash)
+);
+
+-- MinHash signatures of processed resumes, for near-duplicate detection
+CREATE TABLE IF NOT EXISTS resume_signatures (
+    signature_id VARCHAR(64) PRIMARY KEY,
+    signature TEXT NOT NULL,
+    result TEXT NOT NULL,
+    catalog_version VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- LSH band buckets pointing at resume signatures
+CREATE TABLE IF NOT EXISTS resume_signature_bands (
+    band_key VARCHAR(32) NOT NULL,
+    signature_id VARCHAR(64) NOT NULL REFERENCES resume_signatures(signature_id)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS resume_signature_bands_idx ON resume_signature_bands (band_key, signature_id);
@@ -0,0 +1,41 @@
+import os
+import zlib
+from typing import Tuple
+
+# zstandard is optional; zlib from the standard library is the fallback
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD = "zstd"
+ZLIB = "zlib"
+
+
+def default_codec() -> str:
+    """Codec for new rows: TEXT_COMPRESSION if set, else zstd when installed"""
+    codec = os.getenv("TEXT_COMPRESSION") or (ZSTD if zstandard is not None else ZLIB)
+    if codec == ZSTD and zstandard is None:
+        raise ValueError("TEXT_COMPRESSION=zstd requires the zstandard package")
+    if codec not in (ZSTD, ZLIB):
+        raise ValueError(f"Unknown TEXT_COMPRESSION '{codec}', expected '{ZSTD}' or '{ZLIB}'")
+    return codec
+
+
+def compress_text(text: str, codec: str = None) -> Tuple[str, bytes]:
+    """Compress text, returning the codec used alongside the data"""
+    codec = codec or default_codec()
+    data = text.encode("utf-8")
+    if codec == ZSTD:
+        return codec, zstandard.ZstdCompressor(level=9).compress(data)
+    return ZLIB, zlib.compress(data, 6)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of compress_text"""
+    data = bytes(data)
+    if codec == ZSTD:
+        if zstandard is None:
+            raise ValueError("Text was compressed with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
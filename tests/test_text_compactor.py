@@ -0,0 +1,30 @@
+from tools.text_compactor import compact_resume_text
+
+HEADER = "Jane Smith | jane@x.com | 555-123-4567"
+
+
+def test_repeated_contact_header_survives_once():
+    text = "\x0c".join(
+        [
+            f"{HEADER}\nExperience\n- Built things\n- Led a team of five\nAcme Corp\n1",
+            f"{HEADER}\nEducation\n- Built things\nBSc Computer Science\nPage 2 of 2",
+        ]
+    )
+
+    compacted, _ = compact_resume_text(text)
+    lines = compacted.splitlines()
+
+    assert lines.count(HEADER) == 1
+    assert lines[0] == HEADER
+    # Repeated under two sections, away from the page edges
+    assert lines.count("- Built things") == 2
+    assert "1" not in lines
+    assert "Page 2 of 2" not in lines
+
+
+def test_numbers_inside_a_page_are_content():
+    text = "Jane Smith\nLanguages\n3\nPython\nSQL\nGo\nRust"
+
+    compacted, _ = compact_resume_text(text)
+
+    assert "3" in compacted.splitlines()
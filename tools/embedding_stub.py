@@ -0,0 +1,98 @@
+"""A local stand-in for the OpenAI embeddings endpoint, for tests and benchmarks.
+
+Returns deterministic vectors (hashed bag of words, L2-normalized), so texts
+sharing words come out similar without network access or API costs:
+
+    python -m tools.embedding_stub --port 8765
+    EMBEDDING_BASE_URL=http://localhost:8765/v1 python -m agents.embedding_service jobs
+"""
+import argparse
+import array
+import base64
+import hashlib
+import json
+import logging
+import math
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+def stub_embedding(text: str, dimensions: int) -> List[float]:
+    """Signed hashing of the text's words into `dimensions` buckets"""
+    vector = [0.0] * dimensions
+    for word in re.findall(r"\w+", text.lower()):
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _encode(vector: List[float], encoding_format: str):
+    if encoding_format == "base64":
+        # Little-endian float32, which the openai client requests when numpy is installed
+        return base64.b64encode(array.array("f", vector).tobytes()).decode("ascii")
+    return vector
+
+
+def make_handler(dimensions: int):
+    class EmbeddingHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/embeddings"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            inputs = body.get("input", [])
+            if isinstance(inputs, str):
+                inputs = [inputs]
+
+            payload = json.dumps(
+                {
+                    "object": "list",
+                    "model": body.get("model"),
+                    "data": [
+                        {
+                            "object": "embedding",
+                            "index": i,
+                            "embedding": _encode(
+                                stub_embedding(text, dimensions), body.get("encoding_format", "float")
+                            ),
+                        }
+                        for i, text in enumerate(inputs)
+                    ],
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0},
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return EmbeddingHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.dimensions))
+    print(f"Serving stub embeddings on http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+# numpy is imported where it's used, keeping it off the app's startup path
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard similarity almost always share a band
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+@lru_cache(maxsize=1)
+def _permutations():
+    """Fixed (a, b) coefficients of the MinHash permutations"""
+    import numpy as np
+
+    rng = np.random.RandomState(42)
+    a = rng.randint(1, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+    return a, b
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip punctuation so formatting edits don't change the signature"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _shingle_hashes(text: str) -> "np.ndarray":
+    import numpy as np
+
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {
+            " ".join(words[i : i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        }
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little")
+            for s in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+def minhash_signature(text: str) -> "np.ndarray":
+    """MinHash signature of the normalized text's word shingles"""
+    import numpy as np
+
+    a, b = _permutations()
+    hashes = _shingle_hashes(normalize_text(text))
+    # (a * x + b) mod p for every permutation and shingle, then the minimum per permutation
+    permuted = (np.outer(a, hashes) + b[:, None]) % np.uint64(_MERSENNE_PRIME)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: "np.ndarray") -> List[str]:
+    """LSH bucket keys, one per band of the signature"""
+    rows = NUM_PERMUTATIONS // NUM_BANDS
+    return [
+        f"{band}:{hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(NUM_BANDS)
+    ]
+
+
+def estimate_similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+    """Estimated Jaccard similarity between two signatures"""
+    import numpy as np
+
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """Persistent MinHash/LSH index of processed resumes.
+
+    Only rows sharing at least one band bucket are compared, so a lookup is a
+    single indexed query no matter how many resumes have been processed.
+    """
+
+    def __init__(self, db, threshold: Optional[float] = None):
+        self.db = db
+        self.threshold = threshold or float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+
+    def find(self, text: str) -> Optional[Dict[str, Any]]:
+        """Most similar previously processed resume above the threshold"""
+        import numpy as np
+
+        if not text.strip():
+            return None
+        signature = minhash_signature(text)
+        best = None
+        for row in self.db.find_resume_signatures(band_keys(signature)):
+            similarity = estimate_similarity(
+                signature, np.frombuffer(bytes.fromhex(row["signature"]), dtype=np.uint32)
+            )
+            if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                best = {**row, "similarity": similarity}
+
+        if best is None:
+            return None
+        return {
+            "signature_id": best["signature_id"],
+            "similarity": best["similarity"],
+            "catalog_version": best["catalog_version"],
+            "result": json.loads(best["result"]),
+        }
+
+    def add(self, text: str, result: Dict[str, Any], catalog_version: str):
+        """Index a processed resume together with its pipeline result"""
+        if not text.strip():
+            return
+        signature = minhash_signature(text)
+        signature_id = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+        try:
+            self.db.add_resume_signature(
+                signature_id,
+                signature.tobytes().hex(),
+                band_keys(signature),
+                json.dumps(result, default=str),
+                catalog_version,
+            )
+        except Exception as e:
+            # The index is an optimization; a failed insert must not fail the application
+            logger.error(f"Error indexing resume signature: {str(e)}")
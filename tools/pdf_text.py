@@ -0,0 +1,184 @@
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Union
+
+# pdfminer is imported where it's used, keeping it off the app's startup path
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all extractions in this process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: the app process holds threads and open connections
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next extraction starts a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pages(
+    source: Union[str, bytes], page_numbers: list, laparams: Dict[str, Any]
+) -> str:
+    """Extract text from a subset of pages of a file path or in-memory PDF"""
+    from pdfminer.high_level import extract_text
+    from pdfminer.layout import LAParams
+
+    return extract_text(
+        source if isinstance(source, str) else BytesIO(source),
+        page_numbers=page_numbers,
+        laparams=LAParams(**laparams),
+    )
+
+
+class PDFTextExtractor:
+    """Extract resume text from PDFs within a page and character budget.
+
+    Documents that fit in a single chunk are extracted inline. Longer ones
+    are split by page across a process pool, and extraction stops as soon
+    as the character budget is reached.
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        pages_per_chunk: Optional[int] = None,
+        workers: Optional[int] = None,
+        laparams: Optional[Dict[str, Any]] = None,
+    ):
+        self.max_pages = max_pages or int(os.getenv("EXTRACTOR_MAX_PAGES", "10"))
+        self.max_chars = max_chars or int(os.getenv("EXTRACTOR_MAX_CHARS", "20000"))
+        self.pages_per_chunk = pages_per_chunk or int(
+            os.getenv("EXTRACTOR_PAGES_PER_CHUNK", "2")
+        )
+        self.workers = workers or int(
+            os.getenv("EXTRACTOR_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        # e.g. EXTRACTOR_LAPARAMS='{"line_margin": 0.3, "boxes_flow": null}'
+        self.laparams = (
+            laparams
+            if laparams is not None
+            else json.loads(os.getenv("EXTRACTOR_LAPARAMS", "{}"))
+        )
+
+    def _count_pages(self, data: bytes) -> int:
+        """Read the page count from the document catalog"""
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdftypes import resolve1
+
+        try:
+            document = PDFDocument(PDFParser(BytesIO(data)))
+            count = resolve1(resolve1(document.catalog["Pages"])["Count"])
+            if isinstance(count, int):
+                return count
+        except Exception as e:
+            logger.warning(f"Could not read page count from catalog: {str(e)}")
+        return sum(1 for _ in PDFPage.get_pages(BytesIO(data)))
+
+    def _extract_chunks(self, path: str, chunks: List[list], parts: List[str]) -> int:
+        """Extract chunks across the process pool into `parts`, returning the pages extracted"""
+        pool = _get_pool(self.workers)
+        try:
+            futures = [
+                pool.submit(_extract_pages, path, chunk, self.laparams) for chunk in chunks
+            ]
+        except BrokenProcessPool:
+            # A worker died after the last extraction finished
+            _discard_pool(pool)
+            pool = _get_pool(self.workers)
+            futures = [
+                pool.submit(_extract_pages, path, chunk, self.laparams) for chunk in chunks
+            ]
+        pages_extracted = 0
+        broken = False
+        try:
+            for chunk, future in zip(chunks, futures):
+                if not broken:
+                    try:
+                        parts.append(future.result())
+                    except BrokenProcessPool:
+                        # A worker died: finish inline and give later calls a new pool
+                        logger.warning("PDF extraction pool broke, extracting the rest inline")
+                        _discard_pool(pool)
+                        broken = True
+                if broken:
+                    parts.append(_extract_pages(path, chunk, self.laparams))
+                pages_extracted += len(chunk)
+                if sum(len(p) for p in parts) >= self.max_chars:
+                    break
+        finally:
+            # Stop work on pages past the budget
+            for future in futures:
+                future.cancel()
+        return pages_extracted
+
+    def extract(self, source: Union[str, bytes, bytearray, memoryview]) -> Dict[str, Any]:
+        """Extract text from a file path or in-memory PDF"""
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                data = f.read()
+        else:
+            data = bytes(source)
+
+        total_pages = self._count_pages(data)
+        page_count = min(total_pages, self.max_pages)
+        chunks = [
+            list(range(start, min(start + self.pages_per_chunk, page_count)))
+            for start in range(0, page_count, self.pages_per_chunk)
+        ]
+
+        parts = []
+        pages_extracted = 0
+        if len(chunks) <= 1 or self.workers <= 1:
+            # Fast path: short documents don't pay for inter-process transfer
+            for chunk in chunks:
+                parts.append(_extract_pages(data, chunk, self.laparams))
+                pages_extracted += len(chunk)
+                if sum(len(p) for p in parts) >= self.max_chars:
+                    break
+        else:
+            # Workers read the document from disk rather than receiving a copy per chunk
+            path = source if isinstance(source, str) else None
+            if path is None:
+                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                    f.write(data)
+                path = f.name
+            try:
+                pages_extracted = self._extract_chunks(path, chunks, parts)
+            finally:
+                if path is not source:
+                    os.unlink(path)
+
+        text = "".join(parts)
+        truncated = pages_extracted < total_pages or len(text) > self.max_chars
+
+        return {
+            "text": text[: self.max_chars],
+            "total_pages": total_pages,
+            "pages_extracted": pages_extracted,
+            "truncated": truncated,
+        }
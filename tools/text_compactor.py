@@ -0,0 +1,108 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+BULLET_CHARS = "•●▪■□◦○◆◇►▸‣⁃∙·*–—-"
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+LEADING_BULLET_RE = re.compile(rf"^[{re.escape(BULLET_CHARS)}]+\s*")
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Headers/footers are short runs of lines at the very top or bottom of a page,
+# at most this many lines deep
+FURNITURE_DEPTH = 3
+# Longer lines are content even when repeated at page edges
+FURNITURE_MAX_CHARS = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: words and punctuation marks"""
+    return len(TOKEN_RE.findall(text))
+
+
+def _clean_line(line: str) -> Optional[str]:
+    """Collapse whitespace and normalize bullets; None for bullet-only noise"""
+    line = re.sub(r"\s+", " ", line).strip()
+    if LEADING_BULLET_RE.match(line):
+        rest = LEADING_BULLET_RE.sub("", line)
+        return f"- {rest}" if rest else None
+    return line
+
+
+def _page_furniture(pages: List[List[str]]) -> set:
+    """Short lines repeated near the top or bottom of most pages"""
+    pages = [[line for line in lines if line] for lines in pages]
+    pages = [lines for lines in pages if lines]
+    if len(pages) < 2:
+        return set()
+    edges = Counter()
+    for content in pages:
+        edges.update(
+            line
+            for line in set(content[:FURNITURE_DEPTH] + content[-FURNITURE_DEPTH:])
+            if len(line) <= FURNITURE_MAX_CHARS
+        )
+    threshold = max(2, len(pages) // 2 + 1)
+    return {line for line, count in edges.items() if count >= threshold}
+
+
+def _edge_lines(lines: List[str], furniture: set) -> set:
+    """Indices of the furniture and page numbers in unbroken runs from the top or bottom edge"""
+    content = [i for i, line in enumerate(lines) if line]
+    edges = set()
+    for run in (content[:FURNITURE_DEPTH], content[::-1][:FURNITURE_DEPTH]):
+        for i in run:
+            if lines[i] not in furniture and not PAGE_NUMBER_RE.match(lines[i]):
+                break
+            edges.add(i)
+    return edges
+
+
+def compact_resume_text(text: str) -> Tuple[str, Dict[str, int]]:
+    """Strip layout noise from extracted resume text before it reaches the LLM.
+
+    Normalizes ligatures and whitespace, drops page numbers and the repeats
+    of headers/footers at page edges (keeping their first occurrence), tidies
+    bullets and collapses lines repeated back to back. Returns the compacted text and before/after size statistics.
+    """
+    normalized = unicodedata.normalize("NFKC", text)
+    pages = [
+        [line for line in map(_clean_line, page.splitlines()) if line is not None]
+        for page in normalized.split("\x0c")
+    ]
+    furniture = _page_furniture(pages)
+
+    output = []
+    seen_furniture = set()
+    for lines in pages:
+        edges = _edge_lines(lines, furniture)
+        for i, line in enumerate(lines):
+            if not line:
+                if output and output[-1]:
+                    output.append("")
+                continue
+            if i in edges:
+                if PAGE_NUMBER_RE.match(line):
+                    continue
+                # The first occurrence stays, a repeated header may hold the contact details
+                if line in seen_furniture:
+                    continue
+                seen_furniture.add(line)
+            # Only back-to-back repeats: the same bullet can fairly appear under two roles
+            if output and output[-1].casefold() == line.casefold():
+                continue
+            output.append(line)
+
+    compacted = "\n".join(output).strip()
+    tokens_before = estimate_tokens(text)
+    tokens_after = estimate_tokens(compacted)
+
+    return compacted, {
+        "chars_before": len(text),
+        "chars_after": len(compacted),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "token_reduction_pct": round(100 * (1 - tokens_after / tokens_before), 1)
+        if tokens_before
+        else 0.0,
+    }
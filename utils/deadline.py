@@ -0,0 +1,45 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Monotonic time by which the current application must finish. A context
+# variable, so it follows the application into asyncio.to_thread workers and
+# the async database executor.
+_deadline: ContextVar[Optional[float]] = ContextVar("application_deadline", default=None)
+
+
+def default_deadline_seconds() -> Optional[float]:
+    """APPLICATION_DEADLINE_SECONDS, or None when set to 0 (no deadline)"""
+    seconds = float(os.getenv("APPLICATION_DEADLINE_SECONDS", "120"))
+    return seconds if seconds > 0 else None
+
+
+@contextmanager
+def deadline_after(seconds: Optional[float]):
+    """Bound the block to `seconds` from now (None or 0: no bound of its own).
+
+    An enclosing, earlier deadline still applies.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (negative once passed), None without one"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    time_left = remaining()
+    return time_left is not None and time_left <= 0
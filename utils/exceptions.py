@@ -32,3 +32,9 @@ class RecommendationError(ResumeProcessingError):
     """Raised when generating recommendations fails"""
 
     pass
+
+
+class DeadlineExceeded(ResumeProcessingError):
+    """Raised when an application runs out of its time budget"""
+
+    pass
@@ -1,22 +1,98 @@
+import atexit
+import contextvars
+import json
 import logging
-from datetime import datetime
+import logging.handlers
 import os
+import queue
+import threading
+from contextlib import contextmanager
+
+# Application currently being processed, attached to every record logged in its context
+_application_id = contextvars.ContextVar("application_id", default=None)
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class ApplicationContextFilter(logging.Filter):
+    """Stamp records with the application id of the calling context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.application_id = _application_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "application_id": getattr(record, "application_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+@contextmanager
+def application_context(application_id: str):
+    """Attach `application_id` to all log records emitted inside the block"""
+    token = _application_id.set(application_id)
+    try:
+        yield
+    finally:
+        _application_id.reset(token)
 
 
 def setup_logger():
-    """Setup application logging"""
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
-    log_file = os.path.join(
-        log_dir, f"recruitment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    )
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler(log_file), logging.StreamHandler()],
-    )
+    """Setup application logging once per process.
+
+    Records are handed to a queue on the calling thread and written by a
+    background listener, so file I/O never blocks request handling. The log
+    file rotates by size instead of a new file being created per run.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is None:
+            log_dir = os.getenv("LOG_DIR", "logs")
+            os.makedirs(log_dir, exist_ok=True)
+
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(log_dir, "recruitment.log"),
+                maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+                backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(JsonFormatter())
+
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(
+                logging.Formatter(
+                    "%(asctime)s - %(name)s - %(levelname)s - [%(application_id)s] %(message)s"
+                )
+            )
+
+            # Unbounded, so enqueueing never waits on the writer
+            log_queue = queue.Queue(-1)
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.addFilter(ApplicationContextFilter())
+
+            root = logging.getLogger()
+            root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(queue_handler)
+
+            _listener = logging.handlers.QueueListener(
+                log_queue, file_handler, stream_handler, respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(_listener.stop)
 
     return logging.getLogger("AI_Recruiter")
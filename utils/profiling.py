@@ -0,0 +1,125 @@
+import asyncio
+import cProfile
+import contextvars
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc and its peak are process-wide, so profiled applications run one at a time
+_profile_lock = threading.Lock()
+
+# (stage, start time) of each stage the profiled application entered
+_stage_marks: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "stage_marks", default=None
+)
+
+
+def profiling_enabled(requested: bool = False) -> bool:
+    """Profile when the request asks for it or PROFILE_APPLICATIONS is set"""
+    return requested or os.getenv("PROFILE_APPLICATIONS", "false").lower() == "true"
+
+
+def maybe_profile(application_id: str, requested: bool = False):
+    """Profile the block if enabled, otherwise a no-op context"""
+    if not profiling_enabled(requested):
+        return nullcontext()
+    return profile_application(application_id)
+
+
+def mark_stage(stage: str):
+    """Record that the application being profiled entered `stage`"""
+    marks = _stage_marks.get()
+    if marks is not None:
+        marks.append((stage, time.perf_counter()))
+
+
+def _stage_seconds(marks: List[Tuple[str, float]], ended: float) -> Dict[str, float]:
+    seconds = {}
+    for (stage, started), (_, next_started) in zip(marks, marks[1:] + [("", ended)]):
+        seconds[stage] = round(seconds.get(stage, 0.0) + next_started - started, 3)
+    return seconds
+
+
+@asynccontextmanager
+async def profile_application(application_id: str):
+    """Record a CPU profile, memory allocations and stage timings for one application.
+
+    Writes <timestamp>_<application_id>.prof (open with pstats or snakeviz)
+    and a JSON summary with wall time, time per stage, peak memory, the
+    slowest functions and the largest allocation sites to PROFILE_DIR
+    (default logs/profiles). The CPU profile covers the event loop thread;
+    stages mostly wait on worker threads (LLM calls, PDF extraction, database
+    queries), which only show up in the stage timings. Profiled applications
+    run one at a time, but peak memory still includes unprofiled ones being
+    processed at the same time.
+    """
+    output_dir = Path(os.getenv("PROFILE_DIR", os.path.join(os.getenv("LOG_DIR", "logs"), "profiles")))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Polled, so profiled applications on the same event loop don't deadlock it
+    while not _profile_lock.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        stem = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{application_id}"
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "1")))
+        tracemalloc.reset_peak()
+        start_memory, _ = tracemalloc.get_traced_memory()
+        start_snapshot = tracemalloc.take_snapshot()
+        marks = []
+        marks_token = _stage_marks.set(marks)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            ended = time.perf_counter()
+            _stage_marks.reset(marks_token)
+            end_memory, peak_memory = tracemalloc.get_traced_memory()
+            allocations = tracemalloc.take_snapshot().compare_to(start_snapshot, "lineno")
+            if started_tracing:
+                tracemalloc.stop()
+            _write_report(
+                output_dir / stem,
+                {
+                    "application_id": application_id,
+                    "wall_seconds": round(ended - started, 3),
+                    "stage_seconds": _stage_seconds(marks, ended),
+                    "peak_memory_bytes": peak_memory,
+                    "memory_growth_bytes": end_memory - start_memory,
+                    "top_allocations": [
+                        {"location": str(stat.traceback), "size_bytes": stat.size_diff, "count": stat.count_diff}
+                        for stat in allocations[:10]
+                    ],
+                },
+                profiler,
+            )
+    finally:
+        _profile_lock.release()
+
+
+def _write_report(path: Path, summary: dict, profiler: cProfile.Profile):
+    """Write the .prof file and the JSON summary of a profiled application"""
+    profiler.dump_stats(f"{path}.prof")
+    stats_text = io.StringIO()
+    pstats.Stats(profiler, stream=stats_text).sort_stats("cumulative").print_stats(25)
+    summary["top_functions"] = stats_text.getvalue().splitlines()
+    Path(f"{path}.json").write_text(json.dumps(summary, indent=2))
+    logger.info(
+        f"Profiled application in {summary['wall_seconds']:.1f}s, peak memory "
+        f"{summary['peak_memory_bytes'] / 1024 / 1024:.1f} MB: {path}.prof"
+    )